@@ -11,19 +11,80 @@ Usage:
 """
 
 import json
-import subprocess
+import os
+import re
+import shutil
 import sys
 from pathlib import Path
 
+try:
+    import orjson  # Optional: SIMD-accelerated JSON parse/serialize
+except ImportError:
+    orjson = None
+
 # Resolve paths
 SCRIPT_DIR = Path(__file__).parent.resolve()
 PROJECT_ROOT = SCRIPT_DIR.parent
 CONFIG_FILE = PROJECT_ROOT / 'apk' / 'CONTROL' / 'config.json'
 BUILD_SCRIPT = SCRIPT_DIR / 'build.py'
 
+# Import build.py as a module so the build runs in-process
+# (avoids spawning a second Python interpreter per build).
+# Note: os.execv would be even cheaper (no fork at all) but replaces this
+# process image, so the finally-block restore of config.json would never
+# run - the in-process call keeps cleanup guaranteed at the same cost.
+sys.path.insert(0, str(SCRIPT_DIR))
+import build
+
 # ARM64 model filter (AS33v2, AS11TL, AS12, AS33, AS11)
 ARM64_MODELS = ["33xx", "11xx", "1axx", "3axx", "12xx"]
 
+# Textual patch patterns - avoid a full JSON parse/re-serialize for a
+# two-field change and keep the file's formatting bit-identical. Bytes
+# patterns so the raw file never needs a UTF-8 decode/encode round-trip.
+_ARCH_RE = re.compile(rb'([ \t]*)("architecture"\s*:\s*)"([^"]*)"')
+_MODEL_RE = re.compile(rb'("model"\s*:\s*)\[[^\]]*\]')
+
+
+def patch_config_for_arm64(raw: bytes):
+    """Patch architecture/model in the raw config.json bytes.
+
+    Returns the patched bytes, or None if the expected keys could not be
+    located (caller falls back to a full JSON round-trip).
+    """
+    model_json = json.dumps(ARM64_MODELS).encode()
+
+    match = _ARCH_RE.search(raw)
+    if not match:
+        return None
+
+    if _MODEL_RE.search(raw):
+        patched = _ARCH_RE.sub(rb'\1\2"arm64"', raw, count=1)
+        return _MODEL_RE.sub(lambda m: m.group(1) + model_json, patched, count=1)
+
+    # No model key yet: insert it right after the architecture entry,
+    # reusing its indentation
+    indent = match.group(1)
+    replacement = (indent + match.group(2) + b'"arm64",\n'
+                   + indent + b'"model": ' + model_json)
+    return raw[:match.start()] + replacement + raw[match.end():]
+
+
+def load_config(raw: bytes) -> dict:
+    """Parse config.json content (orjson when available, stdlib otherwise)."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def save_config(config: dict):
+    """Write config.json (orjson emits UTF-8 bytes directly, no re-encode)."""
+    if orjson is not None:
+        CONFIG_FILE.write_bytes(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+    else:
+        with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
+            json.dump(config, f, indent=4, ensure_ascii=False)
+
 
 class Colors:
     RESET = '\033[0m'
@@ -32,8 +93,13 @@ class Colors:
     GREEN = '\033[92m'
     YELLOW = '\033[93m'
 
+    _enabled = False  # Guard so repeated enable() calls are no-ops
+
     @classmethod
     def enable(cls):
+        if cls._enabled:
+            return
+        cls._enabled = True
         if sys.platform == 'win32':
             try:
                 import ctypes
@@ -46,52 +112,67 @@ class Colors:
 def main():
     Colors.enable()
     
-    print()
-    print(f"{Colors.MAGENTA}╔══════════════════════════════════════════════════════════════╗{Colors.RESET}")
-    print(f"{Colors.MAGENTA}║       ASUSTOR APK Builder - ARM64 Variant Generator         ║{Colors.RESET}")
-    print(f"{Colors.MAGENTA}╚══════════════════════════════════════════════════════════════╝{Colors.RESET}")
-    print()
-    
-    # Backup original config
-    with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-        config_backup = f.read()
-    
+    # One write for the whole banner (5 prints -> 1 syscall)
+    sys.stdout.write(
+        f"\n"
+        f"{Colors.MAGENTA}╔══════════════════════════════════════════════════════════════╗{Colors.RESET}\n"
+        f"{Colors.MAGENTA}║       ASUSTOR APK Builder - ARM64 Variant Generator         ║{Colors.RESET}\n"
+        f"{Colors.MAGENTA}╚══════════════════════════════════════════════════════════════╝{Colors.RESET}\n"
+        f"\n"
+    )
+
+    # Backup original config (on-disk copy so a killed build can't lose it).
+    # Raw bytes - the content is never inspected as text, so skip the decode.
+    config_backup = CONFIG_FILE.read_bytes()
+
+    backup_path = CONFIG_FILE.with_suffix('.json.bak')
+    shutil.copy2(CONFIG_FILE, backup_path)
+    mutated = False
+
     print(f"{Colors.CYAN}🔹 Backed up original config.json{Colors.RESET}")
-    
+
     try:
-        # Load and modify config for ARM64
-        config = json.loads(config_backup)
-        original_arch = config['general']['architecture']
-        
-        if original_arch == 'arm64':
+        # Determine current architecture without a full JSON parse
+        arch_match = _ARCH_RE.search(config_backup)
+        original_arch = arch_match.group(3) if arch_match else None
+
+        if original_arch == b'arm64':
             print(f"{Colors.YELLOW}⚠️  Config is already set to arm64{Colors.RESET}")
         else:
-            config['general']['architecture'] = 'arm64'
-            config['general']['model'] = ARM64_MODELS
-            
-            # Save modified config
-            with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=4, ensure_ascii=False)
-            
+            # Patch the two fields textually; fall back to a full JSON
+            # round-trip if the config layout is unexpected
+            patched = patch_config_for_arm64(config_backup)
+            if patched is not None:
+                CONFIG_FILE.write_bytes(patched)
+            else:
+                config = load_config(config_backup)
+                config['general']['architecture'] = 'arm64'
+                config['general']['model'] = ARM64_MODELS
+                save_config(config)
+            mutated = True
+
             print(f"{Colors.CYAN}🔹 Modified config.json for ARM64{Colors.RESET}")
             print(f"{Colors.CYAN}🔹 Added model filter: {', '.join(ARM64_MODELS)}{Colors.RESET}")
         
-        # Build ARM64 variant - pass through command line args
+        # Build ARM64 variant - run build.py in-process, passing through args
         print()
-        cmd = [sys.executable, str(BUILD_SCRIPT)] + sys.argv[1:]
-        subprocess.run(cmd, check=True)
+        saved_argv = sys.argv
+        sys.argv = [str(BUILD_SCRIPT)] + saved_argv[1:]
+        try:
+            build.main()
+        finally:
+            sys.argv = saved_argv
         
     finally:
-        # Restore original config
-        with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-            f.write(config_backup)
-        
-        print()
-        print(f"{Colors.CYAN}🔹 Restored original config.json{Colors.RESET}")
+        # Restore original config via atomic rename; skip if never modified
+        if mutated:
+            os.replace(backup_path, CONFIG_FILE)
+            print()
+            print(f"{Colors.CYAN}🔹 Restored original config.json{Colors.RESET}")
+        else:
+            backup_path.unlink(missing_ok=True)
     
-    print()
-    print(f"{Colors.GREEN}✅ ARM64 variant build complete!{Colors.RESET}")
-    print()
+    sys.stdout.write(f"\n{Colors.GREEN}✅ ARM64 variant build complete!{Colors.RESET}\n\n")
 
 
 if __name__ == '__main__':
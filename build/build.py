@@ -13,18 +13,54 @@ Requirements:
 """
 
 import sys
+import os
+import io
+import time
 import argparse
+import contextlib
+import gzip
 import zipfile
 import tarfile
 import tempfile
 import shutil
+import functools
 import json
 import re
+import string
 import hashlib
+import mmap
 import struct
-from datetime import datetime
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 
+try:
+    from isal import igzip  # Optional: ISA-L accelerated DEFLATE/CRC32
+except ImportError:
+    igzip = None
+
+try:
+    from zlib_ng import zlib_ng as _zlib_ng  # Optional: drop-in zlib replacement
+except ImportError:
+    _zlib_ng = None
+else:
+    # zipfile/tarfile/gzip resolve these through the zlib module at call
+    # time, so patching here routes all DEFLATE/CRC32 work through
+    # zlib-ng's SIMD implementations (PCLMULQDQ CRC, AVX2 match search)
+    import zlib
+    zlib.crc32 = _zlib_ng.crc32
+    zlib.compressobj = _zlib_ng.compressobj
+    zlib.decompressobj = _zlib_ng.decompressobj
+
+try:
+    import orjson  # Optional: C-accelerated JSON parsing
+except ImportError:
+    orjson = None
+
+_loads = orjson.loads if orjson is not None else json.loads
+
 __version__ = '1.5.0'
 
 # Resolve paths - script is in build/ folder, project root is parent
@@ -33,6 +69,7 @@ PROJECT_ROOT = SCRIPT_DIR.parent
 RELEASES_DIR = PROJECT_ROOT / 'releases'
 DEV_RELEASES_DIR = RELEASES_DIR / 'dev'
 DEV_BUILD_COUNTER_FILE = SCRIPT_DIR / '.dev-build-counter'
+BUILD_CACHE_FILE = SCRIPT_DIR / '.build-cache.json'  # mtime+hash cache for copied files
 CHANGELOG_MD = PROJECT_ROOT / 'CHANGELOG.md'  # Main changelog (GitHub visible)
 CHANGELOG_TXT = PROJECT_ROOT / 'apk' / 'CONTROL' / 'changelog.txt'  # APK copy
 LICENSE_SRC = PROJECT_ROOT / 'LICENSE'  # Main license (GitHub visible)
@@ -41,6 +78,23 @@ LICENSE_TXT = PROJECT_ROOT / 'apk' / 'CONTROL' / 'license.txt'  # APK copy
 # Configuration
 MAX_DEV_BUILDS = 5  # Keep only the last N dev builds
 
+# Precompiled patterns
+_COPYRIGHT_RE = re.compile(r'Copyright \(c\) \d{4}')
+
+# Optional: pigz compresses gzip blocks on all cores (DEFLATE is the one
+# build step where extra cores genuinely help); fall back to in-process
+# gzip/igzip when it is not on PATH
+_PIGZ = shutil.which('pigz')
+
+# Reproducible builds: honor SOURCE_DATE_EPOCH for all embedded timestamps
+# (https://reproducible-builds.org/specs/source-date-epoch/). When set, tar,
+# gzip and zip members carry this fixed time so identical inputs produce
+# bit-identical APKs and downstream hash caches see hits.
+_SOURCE_DATE_EPOCH = os.environ.get('SOURCE_DATE_EPOCH')
+_DETERMINISTIC = _SOURCE_DATE_EPOCH is not None
+_BUILD_EPOCH = int(_SOURCE_DATE_EPOCH) if _DETERMINISTIC else int(time.time())
+_BUILD_DT = datetime.fromtimestamp(_BUILD_EPOCH, tz=timezone.utc)
+
 
 class Colors:
     """ANSI color codes for terminal output."""
@@ -51,10 +105,15 @@ class Colors:
     RED = '\033[91m'
     BLUE = '\033[94m'
     GRAY = '\033[90m'
-    
+
+    _enabled = False  # Guard so repeated enable() calls are no-ops
+
     @classmethod
     def enable(cls):
         """Enable colors on Windows."""
+        if cls._enabled:
+            return
+        cls._enabled = True
         if sys.platform == 'win32':
             try:
                 import ctypes
@@ -64,22 +123,175 @@ class Colors:
                 # Disable colors if we can't enable ANSI on Windows
                 cls.RESET = cls.GREEN = cls.CYAN = cls.YELLOW = ''
                 cls.RED = cls.BLUE = cls.GRAY = ''
+        _make_prefixes()
+
+
+def _make_prefixes():
+    """(Re)build the color-wrapped prefixes used by the print helpers."""
+    global _SUCCESS_PREFIX, _INFO_PREFIX, _WARN_PREFIX, _ERROR_PREFIX, _FILE_PREFIX
+    _SUCCESS_PREFIX = f"{Colors.GREEN}✅ "
+    _INFO_PREFIX = f"{Colors.CYAN}🔹 "
+    _WARN_PREFIX = f"{Colors.YELLOW}⚠️  "
+    _ERROR_PREFIX = f"{Colors.RED}❌ "
+    _FILE_PREFIX = f"{Colors.GRAY}   📄 "
+
+
+_make_prefixes()
 
 
 def print_success(msg):
-    print(f"{Colors.GREEN}✅ {msg}{Colors.RESET}")
+    print(_SUCCESS_PREFIX, msg, Colors.RESET, sep='')
 
 
 def print_info(msg):
-    print(f"{Colors.CYAN}🔹 {msg}{Colors.RESET}")
+    print(_INFO_PREFIX, msg, Colors.RESET, sep='')
 
 
 def print_warn(msg):
-    print(f"{Colors.YELLOW}⚠️  {msg}{Colors.RESET}")
+    print(_WARN_PREFIX, msg, Colors.RESET, sep='')
 
 
 def print_error(msg):
-    print(f"{Colors.RED}❌ {msg}{Colors.RESET}")
+    print(_ERROR_PREFIX, msg, Colors.RESET, sep='')
+
+
+def _open_gzip_stream(fileobj, compresslevel: int, mtime=None):
+    """Open a writable gzip stream over fileobj.
+
+    Prefers ISA-L's igzip (hand-tuned DEFLATE + hardware CRC32, several
+    times faster than stdlib zlib) when the optional isal package is
+    installed; falls back to the stdlib gzip module.
+    """
+    if igzip is not None:
+        # isal compression levels range 0-3
+        return igzip.IGzipFile(fileobj=fileobj, mode='wb',
+                               compresslevel=min(compresslevel, 3), mtime=mtime)
+    return gzip.GzipFile(fileobj=fileobj, mode='wb',
+                         compresslevel=compresslevel, mtime=mtime)
+
+
+def _zip_entry(name: str):
+    """Zip member name, or a fixed-timestamp ZipInfo when reproducible."""
+    if not _DETERMINISTIC:
+        return name
+    info = zipfile.ZipInfo(name, date_time=_BUILD_DT.timetuple()[:6])
+    info.compress_type = zipfile.ZIP_STORED
+    info.external_attr = 0o644 << 16
+    return info
+
+
+def _mkdtemp(prefix: str, size_hint: int = 0) -> Path:
+    """Create a temp directory, preferring RAM-backed /dev/shm on Linux.
+
+    Intermediates then never touch the block layer (pure page-cache I/O).
+    Falls back to the default temp location when /dev/shm is missing or
+    lacks headroom for size_hint bytes.
+    """
+    if sys.platform == 'linux' and os.path.isdir('/dev/shm'):
+        try:
+            if shutil.disk_usage('/dev/shm').free > 2 * size_hint:
+                return Path(tempfile.mkdtemp(prefix=prefix, dir='/dev/shm'))
+        except OSError:
+            pass
+    return Path(tempfile.mkdtemp(prefix=prefix))
+
+
+def _compress_level(is_dev: bool) -> int:
+    """Gzip level: fastest for throwaway dev builds, balanced for releases."""
+    return 1 if is_dev else 6
+
+
+def _sha256_file(path: Path) -> str:
+    """Compute a file's SHA-256 by streaming, without loading it whole."""
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        # Fallback: hand the whole mapping to OpenSSL in one C call so the
+        # SHA-NI path sees large contiguous input (no per-chunk hops)
+        sha256_hash = hashlib.sha256()
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                sha256_hash.update(mm)
+        except (ValueError, OSError):
+            # Empty file or mmap unavailable - chunked read
+            for chunk in iter(lambda: f.read(1 << 17), b''):
+                sha256_hash.update(chunk)
+        return sha256_hash.hexdigest()
+
+
+# ============================================================================
+# BUILD CACHE
+# ============================================================================
+
+_build_cache = None  # Lazily loaded contents of BUILD_CACHE_FILE
+_build_cache_lock = threading.Lock()  # Serializes cache persistence
+
+
+def _get_build_cache() -> dict:
+    """Load the build cache (mtime + sha256 per source file) once."""
+    global _build_cache
+    with _build_cache_lock:
+        if _build_cache is None:
+            _build_cache = {}
+            if BUILD_CACHE_FILE.exists():
+                try:
+                    _build_cache = json.loads(BUILD_CACHE_FILE.read_text(encoding='utf-8'))
+                except (ValueError, OSError):
+                    _build_cache = {}
+    return _build_cache
+
+
+def _save_build_cache():
+    """Persist the build cache to disk."""
+    if _build_cache is not None:
+        with _build_cache_lock:
+            BUILD_CACHE_FILE.write_text(
+                json.dumps(_build_cache, indent=2), encoding='utf-8')
+
+
+@functools.lru_cache(maxsize=8)
+def _load_json_cached(path: str, mtime_ns: int) -> dict:
+    """Parse a JSON file, memoized by (path, mtime) so repeat reads are free.
+
+    Callers must treat the returned dict as read-only - it is shared by
+    every caller that sees the same (path, mtime) key.
+    """
+    return _loads(Path(path).read_bytes())
+
+
+def _source_unchanged(src: Path, dst: Path, extra: str = '') -> bool:
+    """Check whether src is unchanged since the last build (and dst exists).
+
+    Uses a fast mtime check first, falling back to a sha256 comparison if
+    the mtime differs (e.g. after a fresh checkout). Updates the cache
+    entry when the source changed, so the caller should rewrite dst and
+    then call _save_build_cache().
+
+    Args:
+        src: Source file to check
+        dst: Generated file that would be rewritten
+        extra: Extra state to fold into the cache key (e.g. current year)
+    """
+    cache = _get_build_cache()
+    key = src.name
+    entry = cache.get(key)
+    st = src.stat()
+
+    if dst.exists() and entry and entry.get('extra', '') == extra:
+        if entry.get('mtime_ns') == st.st_mtime_ns:
+            return True
+        digest = _sha256_file(src)
+        if entry.get('sha256') == digest:
+            # Content identical, only mtime changed - refresh it
+            entry['mtime_ns'] = st.st_mtime_ns
+            _save_build_cache()
+            return True
+        cache[key] = {'mtime_ns': st.st_mtime_ns, 'sha256': digest, 'extra': extra}
+        return False
+
+    digest = _sha256_file(src)
+    cache[key] = {'mtime_ns': st.st_mtime_ns, 'sha256': digest, 'extra': extra}
+    return False
 
 
 # ============================================================================
@@ -97,11 +309,21 @@ def update_changelog(version: str, package_version: str = None, is_dev: bool = F
     if not CHANGELOG_MD.exists():
         print_warn("CHANGELOG.md not found, skipping")
         return
-    
-    # Read main CHANGELOG.md and copy to APK changelog.txt
-    content = CHANGELOG_MD.read_text(encoding='utf-8')
-    CHANGELOG_TXT.write_text(content, encoding='utf-8', newline='\n')
-    
+
+    # Skip the write entirely if the source is unchanged since last build
+    if _source_unchanged(CHANGELOG_MD, CHANGELOG_TXT):
+        print_success("Changelog unchanged (cached)")
+        return
+
+    # Copy CHANGELOG.md to APK changelog.txt byte-for-byte (kernel-level
+    # copy via sendfile/CopyFileEx); only rewrite if CRLF needs normalizing
+    content = CHANGELOG_MD.read_bytes()
+    if b'\r\n' in content:
+        CHANGELOG_TXT.write_bytes(content.replace(b'\r\n', b'\n'))
+    else:
+        shutil.copyfile(CHANGELOG_MD, CHANGELOG_TXT)
+    _save_build_cache()
+
     print_success("Changelog copied to APK")
 
 
@@ -111,19 +333,24 @@ def copy_license():
         print_warn("LICENSE file not found, skipping")
         return
     
-    content = LICENSE_SRC.read_text(encoding='utf-8')
-    
+    # Skip the write if the source (and the year baked into the copy) is
+    # unchanged since last build
+    current_year = _BUILD_DT.year
+    if _source_unchanged(LICENSE_SRC, LICENSE_TXT, extra=str(current_year)):
+        return
+
+    original = LICENSE_SRC.read_text(encoding='utf-8')
+
     # Update copyright year to current year
-    current_year = datetime.now().year
-    content = re.sub(r'Copyright \(c\) \d{4}', f'Copyright (c) {current_year}', content)
-    
+    content = _COPYRIGHT_RE.sub(f'Copyright (c) {current_year}', original)
+
     LICENSE_TXT.write_text(content, encoding='utf-8', newline='\n')
-    
+
     # Also update source LICENSE if year changed
-    original = LICENSE_SRC.read_text(encoding='utf-8')
-    if original != content:
+    if content != original:
         LICENSE_SRC.write_text(content, encoding='utf-8', newline='\n')
         print_info(f"Updated copyright year to {current_year}")
+    _save_build_cache()
 
 
 # ============================================================================
@@ -145,31 +372,66 @@ def safe_extract_zip(zip_path: Path, dest_path: Path):
     Raises:
         ValueError: If a path traversal attempt is detected
     """
-    dest_path = dest_path.resolve()
-    
     with zipfile.ZipFile(zip_path, 'r') as zip_file:
-        for member in zip_file.namelist():
-            # Compute the full path where the file would be extracted
-            member_path = (dest_path / member).resolve()
-            
-            # Check that the path is within the destination directory
-            try:
-                member_path.relative_to(dest_path)
-            except ValueError:
-                raise ValueError(f"Path traversal detected in ZIP: {member}")
-            
-            # Extract the member
-            zip_file.extract(member, dest_path)
+        _validate_zip_members(zip_file, dest_path)
+        # All names validated - extract in one pass (reuses the open
+        # handle and central directory instead of per-member seeks)
+        zip_file.extractall(dest_path)
+
+
+@contextlib.contextmanager
+def _open_tar_read(tar_path: Path):
+    """Open a tar.gz for reading through a 1 MiB buffer.
+
+    The large buffer coalesces reads into few syscalls and hands the
+    DEFLATE codec big contiguous chunks instead of the default ~8 KiB.
+    """
+    with open(tar_path, 'rb', buffering=1 << 20) as f, \
+            tarfile.open(fileobj=f, mode='r:gz') as tar:
+        tar.copybufsize = 1 << 20  # 1 MiB member copies (default is 16 KiB)
+        yield tar
+
+
+def _extract_tar(tar_path: Path, dest_path: Path):
+    """Extract a tar.gz archive with the safe 'data' filter."""
+    with _open_tar_read(tar_path) as tar:
+        tar.extractall(dest_path, filter='data', numeric_owner=True)
+
+
+def _validate_zip_members(zip_file: zipfile.ZipFile, dest_path: Path):
+    """Raise ValueError if any member would escape dest_path (zip slip).
+
+    The destination is resolved once; per-member validation is pure
+    string work (no realpath/stat syscall per entry).
+    """
+    base = os.path.realpath(dest_path)
+    base_sep = base + os.sep
+
+    for member in zip_file.namelist():
+        # Compute the full path where the file would be extracted
+        full = os.path.normpath(os.path.join(base, member))
+
+        # Check that the path is within the destination directory
+        if full != base and not full.startswith(base_sep):
+            raise ValueError(f"Path traversal detected in ZIP: {member}")
 
 
 def convert_to_unix_line_endings(file_path: Path):
     """Convert a file from Windows (CRLF) to Unix (LF) line endings."""
     try:
-        content = file_path.read_bytes()
-        if b'\r\n' in content:
-            content = content.replace(b'\r\n', b'\n')
-            file_path.write_bytes(content)
-            return True
+        # Gate on an mmap scan: LF-only files (the common case) are never
+        # fully read into Python, let alone rewritten
+        with open(file_path, 'rb') as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return False  # Empty file, nothing to convert
+            with mm:
+                if mm.find(b'\r\n') == -1:
+                    return False
+                content = bytes(mm).replace(b'\r\n', b'\n')
+        file_path.write_bytes(content)
+        return True
     except Exception as e:
         print_warn(f"Could not convert {file_path.name}: {e}")
     return False
@@ -187,13 +449,17 @@ class ApkBuilder:
     # Required fields per ASUSTOR Developer Guide
     REQUIRED_FIELDS = ['package', 'name', 'version', 'developer', 'maintainer', 
                        'email', 'website', 'architecture', 'firmware']
-    VALID_PACKAGE_PATTERN = re.compile(r'^[a-zA-Z0-9.+-]+$')
-    VALID_VERSION_PATTERN = re.compile(r'^\d+(\.\d+){1,3}(\.r\d+)?$')  # X.Y.Z or X.Y.Z.rNNNN
-    VALID_FIRMWARE_PATTERN = re.compile(r'^\d+\.\d+(\.\d+)?$')
+    # Allowed package-name characters; the patterns these checks replace are
+    # degenerate enough that str/set primitives beat the regex engine
+    VALID_PACKAGE_CHARS = frozenset(string.ascii_letters + string.digits + '.+-')
     VALID_ARCHITECTURES = ['x86-64', 'arm64', 'any']  # Per ASUSTOR spec
     VALID_MODELS = ['11xx', '33xx', '52xx', '53xx', '54xx', '63xx', '64xx', 
                     '65xx', '66xx', '67xx', '68xx', '71xx', '72xx', '1axx', '3axx', '12xx']
     
+    # PNG header layout: signature, IHDR length, chunk type, width, height
+    _PNG_HDR = struct.Struct('>8s4s4sII')
+    _PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
     # Required control files (per ASUSTOR specification)
     REQUIRED_CONTROL_FILES = ['config.json', 'icon.png']
     
@@ -265,13 +531,11 @@ class ApkBuilder:
         return True
     
     def _get_png_dimensions(self, png_path: Path) -> tuple:
-        """Read PNG dimensions from header."""
+        """Read PNG dimensions from the IHDR header (single unpack, no slices)."""
         try:
             with open(png_path, 'rb') as f:
-                header = f.read(24)
-                if header[:8] == b'\x89PNG\r\n\x1a\n':
-                    width = struct.unpack('>I', header[16:20])[0]
-                    height = struct.unpack('>I', header[20:24])[0]
+                sig, _, _, width, height = self._PNG_HDR.unpack_from(f.read(24))
+                if sig == self._PNG_SIGNATURE:
                     return width, height
         except (OSError, struct.error):
             # File unreadable or invalid PNG header
@@ -290,12 +554,30 @@ class ApkBuilder:
     def _has_crlf_endings(self, file_path: Path) -> bool:
         """Check if file has Windows CRLF line endings."""
         try:
+            # Zero-copy scan over the mapped pages (C-level memchr), so the
+            # whole file is checked without read() syscalls or a bytes copy
             with open(file_path, 'rb') as f:
-                content = f.read(4096)  # Check first 4KB
-                return b'\r\n' in content
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return mm.find(b'\r\n') != -1
+        except ValueError:
+            return False  # Empty file cannot be mapped (and has no CRLF)
         except Exception:
             return False
     
+    @staticmethod
+    def _is_valid_version(version: str) -> bool:
+        """Check X.Y[.Z[.W]] with optional trailing .rNNNN revision."""
+        parts = version.split('.')
+        if parts[-1].startswith('r') and parts[-1][1:].isdigit():
+            parts = parts[:-1]
+        return 2 <= len(parts) <= 4 and all(p.isdigit() for p in parts)
+
+    @staticmethod
+    def _is_valid_firmware(firmware: str) -> bool:
+        """Check X.Y or X.Y.Z firmware version format."""
+        parts = firmware.split('.')
+        return 2 <= len(parts) <= 3 and all(p.isdigit() for p in parts)
+
     def validate_config(self, config: dict) -> bool:
         """Validate required fields in config.json (matches original apkg-tools)."""
         # Check required fields
@@ -311,7 +593,7 @@ class ApkBuilder:
         
         # Validate package name format
         package_name = config['general']['package']
-        if not self.VALID_PACKAGE_PATTERN.match(package_name):
+        if not package_name or not set(package_name).issubset(self.VALID_PACKAGE_CHARS):
             print_error(f"Invalid package name: {package_name} (valid characters: [a-zA-Z0-9.+-])")
             return False
         
@@ -323,12 +605,12 @@ class ApkBuilder:
         
         # Validate version format (warning only)
         version = config['general']['version']
-        if not self.VALID_VERSION_PATTERN.match(version):
+        if not self._is_valid_version(version):
             print_warn(f"Version '{version}' may not follow semantic versioning (X.Y.Z)")
-        
+
         # Validate firmware format (warning only)
         firmware = config['general']['firmware']
-        if not self.VALID_FIRMWARE_PATTERN.match(firmware):
+        if not self._is_valid_firmware(firmware):
             print_warn(f"Firmware '{firmware}' format may be invalid (expected: X.Y or X.Y.Z)")
         
         # Validate model if specified
@@ -344,105 +626,201 @@ class ApkBuilder:
         return True
     
     def get_config(self) -> dict:
-        """Read and parse config.json."""
-        with open(self.config_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        """Read and parse config.json (memoized by path + mtime)."""
+        mtime_ns = self.config_file.stat().st_mtime_ns
+        return _load_json_cached(str(self.config_file), mtime_ns)
     
     def convert_line_endings(self):
         """Convert all shell and python scripts to Unix line endings."""
         print_info("Converting scripts to Unix line endings...")
-        
-        # Convert scripts in CONTROL (.sh and .py)
-        for pattern in ['*.sh', '*.py']:
+
+        # Collect candidates first, then convert in parallel - each file is
+        # an independent read/rewrite that releases the GIL during I/O, so a
+        # thread pool overlaps the disk latency across scripts
+        targets = []  # (display label, path)
+        for pattern in ('*.sh', '*.py'):
             for script_file in self.control_dir.glob(pattern):
-                if convert_to_unix_line_endings(script_file):
-                    print(f"{Colors.GRAY}   📄 {script_file.name}{Colors.RESET}")
-        
-        # Convert scripts in /scripts folder
+                targets.append((script_file.name, script_file))
+
         scripts_dir = self.source_dir / 'scripts'
         if scripts_dir.is_dir():
             for sh_file in scripts_dir.glob('*.sh'):
-                if convert_to_unix_line_endings(sh_file):
-                    print(f"{Colors.GRAY}   📄 scripts/{sh_file.name}{Colors.RESET}")
-        
+                targets.append((f"scripts/{sh_file.name}", sh_file))
+
+        if targets:
+            with ThreadPoolExecutor(max_workers=min(len(targets), 8)) as executor:
+                converted = executor.map(convert_to_unix_line_endings,
+                                         (path for _, path in targets))
+                # One write for all converted names (prebuilt prefix, no
+                # per-file f-string or print syscall), in collection order
+                lines = [f"{_FILE_PREFIX}{label}{Colors.RESET}\n"
+                         for (label, _), changed in zip(targets, converted)
+                         if changed]
+                if lines:
+                    sys.stdout.write(''.join(lines))
+
         print_success("Line endings converted")
     
-    def create_tar_gz(self, tar_path: Path, source_path: Path, exclude_dirs: list = None):
-        """Create a tar.gz archive with proper Unix permissions and ownership."""
-        exclude_dirs = exclude_dirs or []
-        
-        with tarfile.open(tar_path, 'w:gz') as tar:
-            for item in source_path.rglob('*'):
-                # Skip excluded directories
-                rel_path = item.relative_to(source_path)
-                if any(part in exclude_dirs for part in rel_path.parts):
+    @staticmethod
+    def _walk(root: Path, exclude_dirs: list):
+        """Yield (DirEntry, relative posix path) for all entries under root.
+
+        os.scandir-based: one getdents64 per directory and a cached stat
+        per entry, versus the 3-4 stat calls of rglob + is_file/is_dir +
+        gettarinfo. Entries come out sorted (parents before children) so
+        archive order is stable across filesystems.
+        """
+        stack = [(root, '')]
+        while stack:
+            dir_path, rel = stack.pop()
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+            for entry in entries:
+                if entry.name in exclude_dirs:
                     continue
-                
-                # Handle both files and directories
-                if item.is_file() or item.is_dir():
-                    # Create TarInfo with Unix-style path
-                    arcname = './' + str(rel_path).replace('\\', '/')
-                    
-                    # Get file info
-                    info = tar.gettarinfo(item, arcname=arcname)
-                    
-                    # Set Unix permissions based on file type
-                    if item.is_dir():
-                        info.mode = 0o755
-                    elif item.suffix in ['.sh', '.py']:
-                        info.mode = 0o755  # Executable scripts
-                    else:
-                        info.mode = 0o644  # Regular files
-                    
-                    # Set owner to root (uid=0, gid=0) - matches original apkg-tools
-                    info.uid = 0
-                    info.gid = 0
-                    info.uname = 'root'
-                    info.gname = 'root'
-                    
-                    if item.is_file():
-                        with open(item, 'rb') as f:
-                            tar.addfile(info, f)
-                    else:
-                        tar.addfile(info)  # Directory entry
+                entry_rel = f"{rel}/{entry.name}" if rel else entry.name
+                yield entry, entry_rel
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, entry_rel))
+
+    def create_tar_gz(self, fileobj, source_path: Path, exclude_dirs: list = None,
+                      compresslevel: int = 6):
+        """Stream a tar.gz archive with proper Unix permissions and ownership.
+
+        Writes into an already-open file object ('w|gz' streaming mode, no
+        seeks), so the archive can be piped straight into a zip member
+        without an intermediate temp file. Level 6 by default - the stdlib
+        default of 9 is ~2x slower for a negligible size win.
+        """
+        exclude_dirs = exclude_dirs or []
+
+        # pigz splits the input into blocks and DEFLATEs them on every core,
+        # emitting a standard gzip stream. Skipped for SOURCE_DATE_EPOCH
+        # builds (pigz offers no way to pin the gzip header mtime).
+        if _PIGZ and not _DETERMINISTIC:
+            self._create_tar_pigz(fileobj, source_path, exclude_dirs, compresslevel)
+            return
+
+        # Explicit gzip wrapper: tarfile's stream mode only grew a
+        # compresslevel argument in Python 3.12. A fixed mtime keeps the
+        # gzip header reproducible under SOURCE_DATE_EPOCH.
+        gz_mtime = _BUILD_EPOCH if _DETERMINISTIC else None
+        with io.BufferedWriter(fileobj, buffer_size=1 << 20) as buffered, \
+                _open_gzip_stream(buffered, compresslevel, mtime=gz_mtime) as gz, \
+                tarfile.open(fileobj=gz, mode='w|') as tar:
+            tar.copybufsize = 1 << 20  # 1 MiB addfile copies
+            self._add_tree(tar, source_path, exclude_dirs)
+
+    def _create_tar_pigz(self, fileobj, source_path: Path, exclude_dirs: list,
+                         compresslevel: int):
+        """Stream the tar through an external pigz process for parallel gzip."""
+        proc = subprocess.Popen(
+            [_PIGZ, '-p', str(os.cpu_count() or 1), f'-{compresslevel}', '-c'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        # Drain pigz output into the destination from a side thread so both
+        # pipe ends stay busy (a full stdout pipe would stall pigz)
+        pump = threading.Thread(target=shutil.copyfileobj,
+                                args=(proc.stdout, fileobj, 1 << 20))
+        pump.start()
+        try:
+            with tarfile.open(fileobj=proc.stdin, mode='w|') as tar:
+                tar.copybufsize = 1 << 20  # 1 MiB addfile copies
+                self._add_tree(tar, source_path, exclude_dirs)
+        finally:
+            proc.stdin.close()  # Signals EOF; pigz flushes and exits
+            pump.join()
+            proc.stdout.close()
+            if proc.wait() != 0:
+                raise RuntimeError(f"pigz exited with status {proc.returncode}")
+
+    def _add_tree(self, tar, source_path: Path, exclude_dirs: list):
+        """Add all entries under source_path to an open tar archive."""
+        for entry, rel in self._walk(source_path, exclude_dirs):
+            is_dir = entry.is_dir(follow_symlinks=False)
+            is_symlink = entry.is_symlink()
+            if not (is_dir or is_symlink or entry.is_file(follow_symlinks=False)):
+                continue  # Sockets, fifos, devices
+
+            # Build TarInfo from the stat cached by scandir (no
+            # re-lstat via gettarinfo)
+            st = entry.stat(follow_symlinks=False)
+            info = tarfile.TarInfo('./' + rel)
+            info.mtime = int(st.st_mtime)
+
+            # Set Unix permissions based on file type
+            if is_dir:
+                info.type = tarfile.DIRTYPE
+                info.mode = 0o755
+            elif is_symlink:
+                info.type = tarfile.SYMTYPE
+                info.linkname = os.readlink(entry.path)
+                info.mode = 0o777
+            else:
+                info.size = st.st_size
+                if entry.name.endswith(('.sh', '.py')):
+                    info.mode = 0o755  # Executable scripts
+                else:
+                    info.mode = 0o644  # Regular files
+
+            # Set owner to root (uid=0, gid=0) - matches original apkg-tools
+            info.uid = 0
+            info.gid = 0
+            info.uname = 'root'
+            info.gname = 'root'
+
+            # Clamp mtimes for reproducible archives
+            if _DETERMINISTIC:
+                info.mtime = min(info.mtime, _BUILD_EPOCH)
+
+            if info.isfile():
+                with open(entry.path, 'rb') as f:
+                    tar.addfile(info, f)
+            else:
+                tar.addfile(info)  # Directory / symlink entry
     
     def _cleanup_old_releases(self, releases_dir: Path, package: str, arch: str, current_version: str):
         """Remove old release packages, keeping only the latest version."""
-        # Pattern: package_version_arch.apk (exclude dev versions)
-        pattern = f"{package}_*_{arch}.apk"
-        
-        for apk_file in releases_dir.glob(pattern):
-            # Extract version from filename
-            name = apk_file.stem  # io.runtipi_4.6.5_x86-64
-            parts = name.split('_')
-            if len(parts) >= 2:
-                file_version = parts[1]
+        # Pattern: package_version_arch.apk, capturing the version directly
+        # (scandir + one compiled regex instead of Path.glob + split)
+        release_re = re.compile(
+            rf'^{re.escape(package)}_(.+?)_{re.escape(arch)}\.apk$')
+
+        with os.scandir(releases_dir) as it:
+            for entry in it:
+                match = release_re.match(entry.name)
+                if not match:
+                    continue
+                file_version = match.group(1)
                 # Skip dev builds (they're in a different folder anyway)
                 if '.dev' in file_version:
                     continue
                 # Remove if not the current version
                 if file_version != current_version:
-                    apk_file.unlink()
+                    os.unlink(entry.path)
                     # Also remove checksum file
-                    sha_file = apk_file.with_suffix('.apk.sha256')
-                    if sha_file.exists():
-                        sha_file.unlink()
-                    print_info(f"Removed old release: {apk_file.name}")
-    
+                    try:
+                        os.unlink(entry.path + '.sha256')
+                    except FileNotFoundError:
+                        pass
+                    print_info(f"Removed old release: {entry.name}")
+
     def _cleanup_old_dev_builds(self, dev_dir: Path, package: str, arch: str):
         """Remove old dev builds, keeping only the last MAX_DEV_BUILDS."""
-        pattern = f"{package}_*.dev*_{arch}.apk"
-        
-        # Get all dev builds sorted by modification time (newest first)
-        dev_builds = sorted(
-            dev_dir.glob(pattern),
-            key=lambda f: f.stat().st_mtime,
-            reverse=True
-        )
-        
+        dev_re = re.compile(
+            rf'^{re.escape(package)}_.+\.dev\d+.*_{re.escape(arch)}\.apk$')
+
+        # Get all dev builds sorted by modification time (newest first);
+        # DirEntry.stat() reuses the stat cached by scandir
+        with os.scandir(dev_dir) as it:
+            dev_builds = sorted(
+                (e for e in it if dev_re.match(e.name)),
+                key=lambda e: e.stat().st_mtime,
+                reverse=True
+            )
+
         # Remove builds beyond MAX_DEV_BUILDS
         for old_build in dev_builds[MAX_DEV_BUILDS:]:
-            old_build.unlink()
+            os.unlink(old_build.path)
             print_info(f"Removed old dev build: {old_build.name}")
 
     def build(self, destination: Path = None, version_override: str = None, is_dev_build: bool = False) -> Path:
@@ -472,9 +850,12 @@ class ApkBuilder:
         config_backup = None
         if version_override:
             config_backup = self.config_file.read_text(encoding='utf-8')
-            config['general']['version'] = version_override
+            # Serialize a copy - the parsed config is shared via the
+            # mtime-keyed cache and must stay pristine
+            overridden = {**config, 'general': {**config['general'],
+                                                'version': version_override}}
             with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=4, ensure_ascii=False)
+                json.dump(overridden, f, indent=4, ensure_ascii=False)
         
         print_info(f"Package: {package}")
         print_info(f"Version: {version}")
@@ -494,61 +875,60 @@ class ApkBuilder:
         
         apk_filename = f"{package}_{version}_{architecture}.apk"
         apk_path = destination / apk_filename
-        
-        # Create temp directory
-        temp_dir = Path(tempfile.mkdtemp(prefix='APKG-'))
-        print_info(f"Temp directory: {temp_dir}")
-        
+
         try:
             # Generate changelog (fetch GitHub release notes + package notes)
             # Extract base version for GitHub API (remove .devN or .rN suffix)
             base_version = re.sub(r'\.[dr][ev]*\d+$', '', original_version)
-            update_changelog(base_version, version, is_dev_build)
-            
-            # Copy license file
-            copy_license()
+
+            # Changelog and license copies are independent pure-I/O steps;
+            # overlap them so a cold cache pays one seek/read, not two
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                futures = [
+                    executor.submit(update_changelog, base_version, version, is_dev_build),
+                    executor.submit(copy_license),
+                ]
+                for future in futures:
+                    future.result()
             
             # Convert line endings
             self.convert_line_endings()
-            
-            # Create apkg-version
-            version_file = temp_dir / self.APK_CONTENTS['version']
-            version_file.write_text(f"{self.APK_VERSION}\n", encoding='utf-8', newline='\n')
-            print_success("Created apkg-version")
-            
-            # Create control.tar.gz
-            print_info("Creating control.tar.gz...")
-            control_tar = temp_dir / self.APK_CONTENTS['control']
-            self.create_tar_gz(control_tar, self.control_dir)
-            print_success("Created control.tar.gz")
-            
-            # Create data.tar.gz (excluding CONTROL and bin directories)
-            print_info("Creating data.tar.gz...")
-            data_tar = temp_dir / self.APK_CONTENTS['data']
-            self.create_tar_gz(data_tar, self.apk_dir, exclude_dirs=['CONTROL', 'bin'])
-            print_success("Created data.tar.gz")
-            
-            # Create APK (ZIP format)
+
+            # Create APK (ZIP format) - tar.gz members are streamed
+            # straight into the zip, no intermediate temp files
             print_info("Creating APK package...")
-            
+
             # Remove existing APK if present
             if apk_path.exists():
                 apk_path.unlink()
-            
-            with zipfile.ZipFile(apk_path, 'w', zipfile.ZIP_DEFLATED) as apk_zip:
-                apk_zip.write(version_file, self.APK_CONTENTS['version'])
-                apk_zip.write(control_tar, self.APK_CONTENTS['control'])
-                apk_zip.write(data_tar, self.APK_CONTENTS['data'])
-            
+
+            level = _compress_level(is_dev_build)
+            # Outer zip is STORED: the two tarballs are already gzipped and
+            # DEFLATE over high-entropy bytes just burns CPU for ~0% gain
+            with zipfile.ZipFile(apk_path, 'w', zipfile.ZIP_STORED) as apk_zip:
+                apk_zip.writestr(_zip_entry(self.APK_CONTENTS['version']),
+                                 f"{self.APK_VERSION}\n")
+                print_success("Created apkg-version")
+
+                print_info("Creating control.tar.gz...")
+                with apk_zip.open(_zip_entry(self.APK_CONTENTS['control']), 'w',
+                                  force_zip64=True) as fobj:
+                    self.create_tar_gz(fobj, self.control_dir, compresslevel=level)
+                print_success("Created control.tar.gz")
+
+                # data.tar.gz excludes the CONTROL and bin directories
+                print_info("Creating data.tar.gz...")
+                with apk_zip.open(_zip_entry(self.APK_CONTENTS['data']), 'w',
+                                  force_zip64=True) as fobj:
+                    self.create_tar_gz(fobj, self.apk_dir, exclude_dirs=['CONTROL', 'bin'],
+                                       compresslevel=level)
+                print_success("Created data.tar.gz")
+
             # Calculate SHA256 checksum (skip for dev builds)
             checksum = None
             if not is_dev_build:
-                sha256_hash = hashlib.sha256()
-                with open(apk_path, 'rb') as f:
-                    for chunk in iter(lambda: f.read(8192), b''):
-                        sha256_hash.update(chunk)
-                checksum = sha256_hash.hexdigest()
-                
+                checksum = _sha256_file(apk_path)
+
                 # Write checksum file
                 checksum_file = apk_path.with_suffix('.apk.sha256')
                 checksum_file.write_text(f"{checksum}  {apk_path.name}", encoding='utf-8')
@@ -581,9 +961,6 @@ class ApkBuilder:
             # Restore original config.json if we modified it (dev mode)
             if config_backup:
                 self.config_file.write_text(config_backup, encoding='utf-8')
-            
-            # Cleanup temp directory
-            shutil.rmtree(temp_dir, ignore_errors=True)
 
 
 def list_apk_contents(apk_path: Path, verbose: bool = False):
@@ -602,7 +979,7 @@ def list_apk_contents(apk_path: Path, verbose: bool = False):
     print_info(f"Size: {apk_path.stat().st_size / 1024:.2f} KB")
     print()
     
-    temp_dir = Path(tempfile.mkdtemp(prefix='APKG-List-'))
+    temp_dir = _mkdtemp('APKG-List-', size_hint=apk_path.stat().st_size * 4)
     
     try:
         safe_extract_zip(apk_path, temp_dir)
@@ -617,12 +994,11 @@ def list_apk_contents(apk_path: Path, verbose: bool = False):
         if control_tar.is_file():
             control_temp = temp_dir / 'CONTROL_temp'
             control_temp.mkdir()
-            with tarfile.open(control_tar, 'r:gz') as tar:
-                tar.extractall(control_temp, filter='data')
+            with _open_tar_read(control_tar) as tar:
+                tar.extractall(control_temp, filter='data', numeric_owner=True)
             
             for config_file in control_temp.rglob('config.json'):
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
+                config = _loads(config_file.read_bytes())
                 general = config.get('general', {})
                 print_info(f"Package: {general.get('name', 'unknown')}")
                 print_info(f"Version: {general.get('version', 'unknown')}")
@@ -633,8 +1009,10 @@ def list_apk_contents(apk_path: Path, verbose: bool = False):
         print()
         print(f"{Colors.CYAN}📁 CONTROL files:{Colors.RESET}")
         if control_tar.is_file():
-            with tarfile.open(control_tar, 'r:gz') as tar:
-                for member in tar.getmembers():
+            with _open_tar_read(control_tar) as tar:
+                # Iterate the tar object directly: members stream out one at
+                # a time instead of getmembers() materializing the full list
+                for member in tar:
                     if member.isfile():
                         size = f"{member.size:>8} B"
                         mode = f"{oct(member.mode)[2:]:>5}"
@@ -644,8 +1022,8 @@ def list_apk_contents(apk_path: Path, verbose: bool = False):
         print(f"{Colors.CYAN}📁 DATA files:{Colors.RESET}")
         data_tar = temp_dir / 'data.tar.gz'
         if data_tar.is_file():
-            with tarfile.open(data_tar, 'r:gz') as tar:
-                for member in tar.getmembers():
+            with _open_tar_read(data_tar) as tar:
+                for member in tar:
                     if member.isfile():
                         size = f"{member.size:>8} B" if verbose else ""
                         mode = f"{oct(member.mode)[2:]:>5}" if verbose else ""
@@ -674,7 +1052,7 @@ def extract_apk(apk_path: Path, destination: Path = None, force: bool = False, v
     
     print_info(f"Extracting: {apk_path}")
     
-    temp_dir = Path(tempfile.mkdtemp(prefix='APKG-Extract-'))
+    temp_dir = _mkdtemp('APKG-Extract-', size_hint=apk_path.stat().st_size * 4)
     
     try:
         # Extract ZIP (APK) safely
@@ -695,8 +1073,8 @@ def extract_apk(apk_path: Path, destination: Path = None, force: bool = False, v
         # Extract control to read config.json
         control_temp = temp_dir / 'CONTROL_temp'
         control_temp.mkdir()
-        with tarfile.open(control_tar, 'r:gz') as tar:
-            tar.extractall(control_temp, filter='data')
+        with _open_tar_read(control_tar) as tar:
+            tar.extractall(control_temp, filter='data', numeric_owner=True)
         
         # Find config.json
         config_file = None
@@ -709,8 +1087,7 @@ def extract_apk(apk_path: Path, destination: Path = None, force: bool = False, v
         package_arch = "unknown"
         
         if config_file and config_file.is_file():
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+            config = _loads(config_file.read_bytes())
             package_name = config['general'].get('name', 'unknown')
             package_version = config['general'].get('version', '0.0.0')
             package_arch = config['general'].get('architecture', 'unknown')
@@ -735,14 +1112,19 @@ def extract_apk(apk_path: Path, destination: Path = None, force: bool = False, v
         
         # Extract data.tar.gz
         print_info("Extracting data...")
-        with tarfile.open(data_tar, 'r:gz') as tar:
-            tar.extractall(output_dir, filter='data')
-        
-        # Create CONTROL folder and extract control.tar.gz
         control_dir = output_dir / 'CONTROL'
         control_dir.mkdir()
-        with tarfile.open(control_tar, 'r:gz') as tar:
-            tar.extractall(control_dir, filter='data')
+
+        # data.tar.gz and control.tar.gz are independent gzip streams and
+        # zlib releases the GIL during inflate, so decompress them in
+        # parallel (overlaps the tiny control tar with the large data tar)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(_extract_tar, data_tar, output_dir),
+                executor.submit(_extract_tar, control_tar, control_dir),
+            ]
+            for future in futures:
+                future.result()
         
         print()
         print(f"{Colors.GREEN}╔══════════════════════════════════════════════════════════════╗{Colors.RESET}")
@@ -759,26 +1141,27 @@ def extract_apk(apk_path: Path, destination: Path = None, force: bool = False, v
 def get_dev_build_number(package_version: str) -> int:
     """Get and increment the dev build counter. Resets if package version changes."""
     counter = 1
-    stored_version = None
-    
-    if DEV_BUILD_COUNTER_FILE.exists():
-        try:
-            content = DEV_BUILD_COUNTER_FILE.read_text().strip()
-            # Format: "version:counter" (e.g., "4.6.5:3" or "4.6.5.r2:1")
-            if ':' in content:
-                stored_version, stored_counter = content.split(':', 1)
-                if stored_version == package_version:
-                    counter = int(stored_counter) + 1
-                else:
-                    print_info(f"Package version changed ({stored_version} → {package_version}), resetting dev counter")
-                    counter = 1
+
+    try:
+        content = DEV_BUILD_COUNTER_FILE.read_text().strip()
+        # Format: "version:counter" (e.g., "4.6.5:3" or "4.6.5.r2:1")
+        if ':' in content:
+            stored_version, stored_counter = content.split(':', 1)
+            if stored_version == package_version:
+                counter = int(stored_counter) + 1
             else:
-                # Legacy format: just a number - reset to be safe
-                counter = 1
-        except (ValueError, IOError):
-            counter = 1
-    
-    DEV_BUILD_COUNTER_FILE.write_text(f"{package_version}:{counter}", encoding='utf-8')
+                print_info(f"Package version changed ({stored_version} → {package_version}), resetting dev counter")
+        # Legacy format (just a number): keep counter = 1 to be safe
+    except FileNotFoundError:
+        pass
+    except (ValueError, IOError):
+        counter = 1
+
+    # Write to a sibling temp file and rename over the counter: os.replace
+    # is atomic, so a build killed mid-write can never corrupt the counter
+    tmp_path = DEV_BUILD_COUNTER_FILE.with_suffix('.tmp')
+    tmp_path.write_text(f"{package_version}:{counter}", encoding='utf-8')
+    os.replace(tmp_path, DEV_BUILD_COUNTER_FILE)
     return counter
 
 
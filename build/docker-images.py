@@ -26,13 +26,35 @@ Sources:
 
 import sys
 import argparse
+import hashlib
 import json
 import re
+import time
 import urllib.request
 import urllib.error
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Dict
 
+try:
+    import yaml  # Optional: proper docker-compose parsing
+    try:
+        from yaml import CSafeLoader as _YamlLoader  # LibYAML C extension
+    except ImportError:
+        from yaml import SafeLoader as _YamlLoader
+except ImportError:
+    yaml = None
+
+try:
+    import urllib3  # Optional: pooled keep-alive HTTP client
+    # One shared pool so consecutive GitHub API calls reuse a TLS session
+    # instead of paying a fresh handshake per request
+    _POOL = urllib3.PoolManager(
+        maxsize=4, retries=urllib3.Retry(total=3, backoff_factor=0.2))
+except ImportError:
+    urllib3 = None
+    _POOL = None
+
 __version__ = '1.0.0'
 
 # Paths
@@ -57,6 +79,43 @@ DEFAULT_IMAGES = {
     'rabbitmq': 'rabbitmq:4-alpine',
 }
 
+# Precompiled patterns (compiled once at import, not per call)
+# docker-compose.yml: image: traefik:v3.6.1 - bytes patterns, so the raw
+# HTTP body is scanned without a whole-buffer UTF-8 decode
+_COMPOSE_IMAGE_RES = {
+    'traefik': re.compile(rb'^\s*image:\s*(traefik:\S+)', re.M),
+    'postgres': re.compile(rb'^\s*image:\s*(postgres:\S+)', re.M),
+    'rabbitmq': re.compile(rb'^\s*image:\s*(rabbitmq:\S+)', re.M),
+}
+# pre-install.sh: pull_image "image:tag" "Name"
+_PULL_IMAGE_RE = re.compile(r'pull_image\s+"([^"]+)"\s+"([^"]+)"')
+# Same call sites with groups for single-pass substitution
+_PULL_IMAGE_SUB_RE = re.compile(r'(pull_image\s+")([^"]+)("\s+"([^"]+)")')
+# Lowercased display name -> image key
+_NAME_TO_KEY = {
+    'traefik': 'traefik',
+    'postgresql': 'postgres',
+    'rabbitmq': 'rabbitmq',
+    'runtipi': 'runtipi',
+}
+# Substring fallback for display names that don't match exactly
+_NAME_SUBSTR_TO_KEY = (
+    ('traefik', 'traefik'),
+    ('postgres', 'postgres'),
+    ('rabbit', 'rabbitmq'),
+    ('runtipi', 'runtipi'),
+)
+# Release notes fallback: traefik ... v3.6.1. Word-anchored with a bounded
+# same-line gap - the old unbounded [^\d]* could go super-linear on long
+# digit-free markdown bodies
+_TRAEFIK_NOTES_RE = re.compile(r'\btraefik\b[^\d\n]{0,40}v?(\d+\.\d+(?:\.\d+)?)', re.I)
+# Cap how much release-note markdown is scanned
+_NOTES_SCAN_LIMIT = 65536
+# Defensive cap on HTTP response bodies (compose file is a few KB)
+_MAX_RESPONSE_BYTES = 1 << 20
+# Version revision suffix: 4.6.5.r1 -> 4.6.5
+_REVISION_RE = re.compile(r'\.r\d+$')
+
 
 class Colors:
     """ANSI color codes for terminal output."""
@@ -78,148 +137,266 @@ class Colors:
             except Exception:
                 cls.RESET = cls.GREEN = cls.CYAN = cls.YELLOW = ''
                 cls.RED = cls.BLUE = cls.GRAY = ''
+        _make_templates()
+
+
+def _make_templates():
+    """(Re)build the color-wrapped templates used by the print helpers."""
+    global _INFO_TPL, _OK_TPL, _WARN_TPL, _ERR_TPL, _ROW_TPL
+    _INFO_TPL = f"{Colors.CYAN}🔹 %s{Colors.RESET}"
+    _OK_TPL = f"{Colors.GREEN}✅ %s{Colors.RESET}"
+    _WARN_TPL = f"{Colors.YELLOW}⚠️  %s{Colors.RESET}"
+    _ERR_TPL = f"{Colors.RED}❌ %s{Colors.RESET}"
+    _ROW_TPL = f"  {Colors.CYAN}{{:12}}{Colors.RESET}: {{}}"
 
 
-def print_info(msg): print(f"{Colors.CYAN}🔹 {msg}{Colors.RESET}")
-def print_success(msg): print(f"{Colors.GREEN}✅ {msg}{Colors.RESET}")
-def print_warn(msg): print(f"{Colors.YELLOW}⚠️  {msg}{Colors.RESET}")
-def print_error(msg): print(f"{Colors.RED}❌ {msg}{Colors.RESET}")
+_make_templates()
+
+
+def _http_get(url: str, headers: Dict[str, str], timeout: int = 10):
+    """GET a URL, returning (body bytes, response headers).
+
+    Goes through the shared urllib3 pool when available; otherwise falls
+    back to urllib.request. Raises urllib.error.HTTPError on non-2xx
+    (including 304) either way, so callers handle one exception type.
+    """
+    if _POOL is not None:
+        resp = _POOL.request('GET', url, headers=headers, timeout=timeout,
+                             preload_content=False)
+        try:
+            if resp.status < 200 or resp.status >= 300:
+                raise urllib.error.HTTPError(url, resp.status,
+                                             resp.reason or '', resp.headers, None)
+            return resp.read(_MAX_RESPONSE_BYTES), resp.headers
+        finally:
+            resp.release_conn()
+
+    req = urllib.request.Request(url, headers=headers)
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        return response.read(_MAX_RESPONSE_BYTES), response.headers
+
+
+def print_info(msg): print(_INFO_TPL % msg)
+def print_success(msg): print(_OK_TPL % msg)
+def print_warn(msg): print(_WARN_TPL % msg)
+def print_error(msg): print(_ERR_TPL % msg)
 
 
 class DockerImagesManager:
     """Manages Docker image versions for Runtipi."""
     
-    def __init__(self):
+    def __init__(self, verbose: bool = True):
         self.cache_file = IMAGES_CACHE_FILE
         self.pre_install = PRE_INSTALL_FILE
-        
+        self.verbose = verbose
+        self._runtipi_version = None
+        self._pre_install_content = None
+
+    def _log(self, msg):
+        """Progress logging, silenced in quiet/library use."""
+        if self.verbose:
+            print_info(msg)
+
     def get_runtipi_version(self) -> str:
-        """Get Runtipi version from config.json."""
-        with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        version = config['general']['version']
-        # Remove revision suffix if present (4.6.5.r1 -> 4.6.5)
-        return re.sub(r'\.r\d+$', '', version)
-    
+        """Get Runtipi version from config.json (read once per instance)."""
+        if self._runtipi_version is None:
+            # One read syscall + one C-level decode/parse, no chunked stream
+            config = json.loads(CONFIG_FILE.read_bytes())
+            version = config['general']['version']
+            # Remove revision suffix if present (4.6.5.r1 -> 4.6.5)
+            self._runtipi_version = _REVISION_RE.sub('', version)
+        return self._runtipi_version
+
     def load_cache(self) -> Optional[Dict]:
         """Load cached image versions."""
-        if self.cache_file.exists():
-            try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception:
-                pass
-        return None
-    
+        try:
+            return json.loads(self.cache_file.read_bytes())
+        except Exception:
+            return None
+
     def save_cache(self, data: Dict):
-        """Save image versions to cache."""
-        with open(self.cache_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+        """Save image versions to cache, merging into existing entries.
+
+        Merging keeps the HTTP validators (etag/last_modified) intact when
+        callers persist only {version, images}.
+        """
+        merged = self.load_cache() or {}
+        merged.update(data)
+        self.cache_file.write_bytes(json.dumps(merged, indent=2).encode())
     
-    def fetch_from_github(self, runtipi_version: str) -> Dict[str, str]:
+    def fetch_from_github(self, runtipi_version: str, max_age: Optional[int] = None) -> Dict[str, str]:
         """Fetch image versions from Runtipi CLI docker-compose.yml.
-        
+
         Strategy:
         1. Try to fetch docker-compose.yml from runtipi/cli repository via GitHub API
         2. Parse the YAML to extract image versions
         3. Fall back to release notes if CLI compose not available
         4. Use defaults as last resort
+
+        Conditional requests: the ETag/Last-Modified of the last successful
+        fetch are replayed as If-None-Match/If-Modified-Since, so an
+        unchanged upstream answers 304 with no body. With max_age set, a
+        cache entry younger than that many seconds skips the network
+        entirely.
         """
         images = DEFAULT_IMAGES.copy()
-        
+        cache = self.load_cache() or {}
+
+        if max_age is not None and cache.get('images'):
+            age = time.time() - cache.get('fetched_at', 0)
+            if 0 <= age <= max_age:
+                self._log(f"Using cached images (age {int(age)}s <= max-age {max_age}s)")
+                images.update(cache['images'])
+                images['runtipi'] = f"ghcr.io/runtipi/runtipi:v{runtipi_version}"
+                return images
+
+        # Pre-warm the release-notes request in parallel: if the compose
+        # fetch fails, the fallback data is already in flight and the total
+        # latency is max(t_compose, t_release) rather than their sum
+        executor = ThreadPoolExecutor(max_workers=1)
+        notes_future = executor.submit(self._fetch_release_body, runtipi_version)
+        executor.shutdown(wait=False)
+
         # Try to fetch docker-compose.yml from CLI repository via GitHub API
         try:
-            print_info(f"Fetching docker-compose.yml from Runtipi CLI...")
-            
+            self._log("Fetching docker-compose.yml from Runtipi CLI...")
+
             api_url = f"{GITHUB_API}/repos/{RUNTIPI_CLI_OWNER}/{RUNTIPI_CLI_REPO}/contents/{RUNTIPI_CLI_COMPOSE_PATH}"
-            req = urllib.request.Request(api_url, headers={
+            headers = {
                 'User-Agent': 'ASUSTOR-Runtipi-Builder/1.0',
                 'Accept': 'application/vnd.github.raw+json'  # Get raw content directly
-            })
-            
-            with urllib.request.urlopen(req, timeout=10) as response:
-                compose_content = response.read().decode('utf-8')
-                
-                # Parse image versions from docker-compose.yml
-                # Pattern: image: traefik:v3.6.1
-                patterns = {
-                    'traefik': r'^\s*image:\s*(traefik:[^\s]+)',
-                    'postgres': r'^\s*image:\s*(postgres:[^\s]+)',
-                    'rabbitmq': r'^\s*image:\s*(rabbitmq:[^\s]+)',
-                }
-                
-                for key, pattern in patterns.items():
-                    match = re.search(pattern, compose_content, re.MULTILINE)
-                    if match:
-                        images[key] = match.group(1)
-                        print_info(f"  Found {key}: {images[key]}")
-                
+            }
+            if cache.get('etag'):
+                headers['If-None-Match'] = cache['etag']
+            if cache.get('last_modified'):
+                headers['If-Modified-Since'] = cache['last_modified']
+
+            body, resp_headers = _http_get(api_url, headers)
+            self._parse_compose_images(body, images)
+            if self.verbose:
                 print_success("docker-compose.yml parsed successfully")
-                
+            # Persist validators for the next conditional request
+            self.save_cache({
+                'etag': resp_headers.get('ETag'),
+                'last_modified': resp_headers.get('Last-Modified'),
+                'fetched_at': time.time(),
+            })
+
         except urllib.error.HTTPError as e:
-            print_warn(f"Could not fetch CLI docker-compose.yml: HTTP {e.code}")
-            print_info("Falling back to release notes...")
-            self._fetch_from_release_notes(runtipi_version, images)
+            if e.code == 304 and cache.get('images'):
+                self._log("Upstream compose unchanged (HTTP 304), using cached images")
+                images.update(cache['images'])
+                self.save_cache({'fetched_at': time.time()})
+            else:
+                if self.verbose:
+                    print_warn(f"Could not fetch CLI docker-compose.yml: HTTP {e.code}")
+                self._log("Falling back to release notes...")
+                self._fetch_from_release_notes(runtipi_version, images, notes_future)
         except Exception as e:
-            print_warn(f"Could not fetch CLI docker-compose.yml: {e}")
-            print_info("Using default versions")
-        
+            if self.verbose:
+                print_warn(f"Could not fetch CLI docker-compose.yml: {e}")
+                print_info("Using default versions")
+
         # Add Runtipi image itself
         images['runtipi'] = f"ghcr.io/runtipi/runtipi:v{runtipi_version}"
-        
+
         return images
     
-    def _fetch_from_release_notes(self, runtipi_version: str, images: Dict[str, str]):
-        """Fallback: try to extract versions from release notes."""
+    def _parse_compose_images(self, compose_content: bytes, images: Dict[str, str]):
+        """Extract image versions from raw docker-compose.yml bytes.
+
+        Parses the YAML properly (one C-speed pass via LibYAML when
+        available) and walks services.*.image, which also handles quoted
+        or reordered forms the old line regexes would miss. Falls back to
+        a bytes-regex scan when PyYAML is not installed; either way the
+        body is never decoded as a whole.
+        """
+        if yaml is not None:
+            doc = yaml.load(compose_content, Loader=_YamlLoader)
+            services = doc.get('services', {}) if isinstance(doc, dict) else {}
+            for spec in services.values():
+                image = spec.get('image', '') if isinstance(spec, dict) else ''
+                # traefik:v3.6.1 -> traefik; ghcr.io/foo/bar:tag -> bar
+                key = image.split(':', 1)[0].rsplit('/', 1)[-1]
+                if key in _COMPOSE_IMAGE_RES:
+                    images[key] = image
+                    self._log(f"  Found {key}: {image}")
+            return
+
+        # Pattern: image: traefik:v3.6.1
+        for key, pattern in _COMPOSE_IMAGE_RES.items():
+            match = pattern.search(compose_content)
+            if match:
+                images[key] = match.group(1).decode('ascii')
+                self._log(f"  Found {key}: {images[key]}")
+
+    def _fetch_release_body(self, runtipi_version: str) -> str:
+        """Fetch the release-notes body for a version (network only, no output)."""
+        release_url = f"{GITHUB_API}/repos/runtipi/runtipi/releases/tags/v{runtipi_version}"
+        body, _ = _http_get(release_url, {
+            'User-Agent': 'ASUSTOR-Runtipi-Builder/1.0',
+            'Accept': 'application/vnd.github.v3+json'
+        })
+        release = json.loads(body)
+        return release.get('body', '')
+
+    def _fetch_from_release_notes(self, runtipi_version: str, images: Dict[str, str],
+                                  future=None):
+        """Fallback: try to extract versions from release notes.
+
+        Consumes the pre-warmed future from fetch_from_github when given,
+        otherwise issues the request itself.
+        """
         try:
-            release_url = f"{GITHUB_API}/repos/runtipi/runtipi/releases/tags/v{runtipi_version}"
-            print_info(f"Fetching release info for v{runtipi_version}...")
-            
-            req = urllib.request.Request(release_url, headers={
-                'User-Agent': 'ASUSTOR-Runtipi-Builder/1.0',
-                'Accept': 'application/vnd.github.v3+json'
-            })
-            
-            with urllib.request.urlopen(req, timeout=10) as response:
-                release = json.loads(response.read().decode('utf-8'))
-                body = release.get('body', '')
-                
-                # Look for traefik version in release notes
-                traefik_match = re.search(r'traefik[^\d]*v?(\d+\.\d+(?:\.\d+)?)', body, re.I)
-                if traefik_match:
-                    version = traefik_match.group(1)
-                    images['traefik'] = f"traefik:v{version}"
-                    print_info(f"  Found Traefik in release notes: v{version}")
-                
+            self._log(f"Fetching release info for v{runtipi_version}...")
+            if future is not None:
+                body = future.result()
+            else:
+                body = self._fetch_release_body(runtipi_version)
+
+            # Look for traefik version in release notes (bounded scan)
+            traefik_match = _TRAEFIK_NOTES_RE.search(body[:_NOTES_SCAN_LIMIT])
+            if traefik_match:
+                version = traefik_match.group(1)
+                images['traefik'] = f"traefik:v{version}"
+                self._log(f"  Found Traefik in release notes: v{version}")
+
         except Exception as e:
-            print_warn(f"Could not fetch release notes: {e}")
+            if self.verbose:
+                print_warn(f"Could not fetch release notes: {e}")
     
+    def _load_pre_install(self) -> Optional[str]:
+        """Read pre-install.sh once per instance (memoized).
+
+        --update both displays the current images and rewrites the script;
+        sharing one read halves the file I/O on that path.
+        """
+        if self._pre_install_content is None:
+            try:
+                self._pre_install_content = self.pre_install.read_text(encoding='utf-8')
+            except FileNotFoundError:
+                return None
+        return self._pre_install_content
+
     def get_current_images_from_script(self) -> Dict[str, str]:
         """Extract current image versions from pre-install.sh."""
         images = {}
-        
-        if not self.pre_install.exists():
+
+        content = self._load_pre_install()
+        if content is None:
             return images
-        
-        content = self.pre_install.read_text(encoding='utf-8')
-        
-        # Pattern to match: pull_image "image:tag" "Name"
-        pattern = r'pull_image\s+"([^"]+)"\s+"([^"]+)"'
-        
-        for match in re.finditer(pattern, content):
-            image = match.group(1)
-            name = match.group(2).lower()
-            
-            # Map name to key
-            if 'traefik' in name.lower():
-                images['traefik'] = image
-            elif 'postgres' in name.lower():
-                images['postgres'] = image
-            elif 'rabbit' in name.lower():
-                images['rabbitmq'] = image
-            elif 'runtipi' in name.lower():
-                images['runtipi'] = image
-        
+
+        for match in _PULL_IMAGE_RE.finditer(content):
+            # One hashed lookup for the common exact names; substring scan
+            # only as a fallback (the old chain re-lowered and rescanned
+            # the name for every branch)
+            low = match.group(2).casefold()
+            key = _NAME_TO_KEY.get(low)
+            if key is None:
+                key = next((k for tag, k in _NAME_SUBSTR_TO_KEY if tag in low), None)
+            if key:
+                images[key] = match.group(1)
+
         return images
     
     def update_pre_install_script(self, images: Dict[str, str], keep_runtipi_var: bool = True) -> bool:
@@ -232,35 +409,44 @@ class DockerImagesManager:
         if not self.pre_install.exists():
             print_error(f"pre-install.sh not found: {self.pre_install}")
             return False
-        
-        content = self.pre_install.read_text(encoding='utf-8')
-        original = content
-        
-        # Update each image in the pull_image calls
-        replacements = [
-            ('traefik', 'Traefik'),
-            ('postgres', 'PostgreSQL'),
-            ('rabbitmq', 'RabbitMQ'),
-        ]
-        
-        # Only update Runtipi image if not keeping the variable
-        if not keep_runtipi_var:
-            replacements.append(('runtipi', 'Runtipi'))
-        
-        for key, name in replacements:
-            if key not in images:
-                continue
-            
-            # Pattern: pull_image "old_image" "Name"
-            pattern = rf'(pull_image\s+")[^"]+("\s+"{name}")'
-            replacement = rf'\g<1>{images[key]}\g<2>'
-            content = re.sub(pattern, replacement, content, flags=re.IGNORECASE)
-        
-        if content != original:
-            self.pre_install.write_text(content, encoding='utf-8')
-            return True
-        
-        return False
+
+        # Short-circuit: if the same images were already applied against the
+        # same file state, skip the read and regex pass entirely
+        cache = self.load_cache() or {}
+        fingerprint = self._update_fingerprint(images)
+        if fingerprint == cache.get('pre_install_fingerprint'):
+            return False
+
+        content = self._load_pre_install()
+
+        # One pass over the file: the callback dispatches on the captured
+        # display name, instead of a full re.sub scan per image key
+        def repl(match):
+            key = _NAME_TO_KEY.get(match.group(4).lower())
+            if key is None or key not in images:
+                return match.group(0)
+            # Only update Runtipi image if not keeping the variable
+            if key == 'runtipi' and keep_runtipi_var:
+                return match.group(0)
+            return match.group(1) + images[key] + match.group(3)
+
+        new_content = _PULL_IMAGE_SUB_RE.sub(repl, content)
+
+        changed = new_content != content
+        if changed:
+            self.pre_install.write_text(new_content, encoding='utf-8')
+            self._pre_install_content = new_content  # Keep the memo in sync
+
+        # Record the post-run state (fresh stat after a write) so the next
+        # identical invocation returns before touching the file
+        self.save_cache({'pre_install_fingerprint': self._update_fingerprint(images)})
+        return changed
+
+    def _update_fingerprint(self, images: Dict[str, str]) -> str:
+        """Fingerprint of (requested images, pre-install.sh file state)."""
+        st = self.pre_install.stat()
+        payload = f"{sorted(images.items())}|{st.st_mtime_ns}|{st.st_size}"
+        return hashlib.sha1(payload.encode()).hexdigest()
     
     def generate_images_config(self, images: Dict[str, str]) -> str:
         """Generate a shell config snippet for Docker images."""
@@ -277,9 +463,109 @@ class DockerImagesManager:
         return '\n'.join(lines)
 
 
+def _handle_show(mgr, args, version):
+    items = sorted(mgr.get_current_images_from_script().items())
+    if args.quiet:
+        for key, img in items:
+            print(f"{key}={img}")
+    else:
+        print_info(f"Current images in pre-install.sh:")
+        for key, img in items:
+            print(_ROW_TPL.format(key, img))
+
+
+def _handle_fetch(mgr, args, version):
+    if not args.quiet:
+        print_info(f"Fetching images for Runtipi v{version}...")
+
+    images = mgr.fetch_from_github(version, max_age=args.max_age)
+    items = sorted(images.items())  # Sort once for both output styles
+
+    if not args.quiet:
+        print_info("Fetched image versions:")
+        for key, img in items:
+            print(_ROW_TPL.format(key, img))
+
+    # Save to cache
+    mgr.save_cache({
+        'version': version,
+        'images': images
+    })
+
+    if args.quiet:
+        for key, img in items:
+            print(f"{key}={img}")
+    else:
+        print_success(f"Saved to cache: {mgr.cache_file.name}")
+
+
+def _handle_update(mgr, args, version):
+    if not args.quiet:
+        print_info(f"Updating images for Runtipi v{version}...")
+
+    # Fetch or use cache
+    cache = mgr.load_cache()
+    if cache and cache.get('version') == version:
+        images = cache['images']
+        if not args.quiet:
+            print_info("Using cached image versions")
+    else:
+        images = mgr.fetch_from_github(version, max_age=args.max_age)
+        mgr.save_cache({'version': version, 'images': images})
+
+    # Show what we'll update
+    if not args.quiet:
+        current = mgr.get_current_images_from_script()
+        print_info("Changes:")
+        # Only show traefik, postgres, rabbitmq (not runtipi which uses variable)
+        for key in ['traefik', 'postgres', 'rabbitmq']:
+            if key not in images:
+                continue
+            old = current.get(key, 'N/A')
+            new = images[key]
+            if old != new:
+                print(_ROW_TPL.format(key, f"{old} → {Colors.GREEN}{new}{Colors.RESET}"))
+            else:
+                print(f"  {Colors.GRAY}{key:12}: {new} (unchanged){Colors.RESET}")
+        # Show runtipi separately
+        print(f"  {Colors.GRAY}runtipi     : ghcr.io/runtipi/runtipi:v${{APKG_PKG_VER}} (dynamic){Colors.RESET}")
+
+    # Update the script (keep Runtipi variable)
+    if mgr.update_pre_install_script(images, keep_runtipi_var=True):
+        if args.quiet:
+            print(f"updated")
+        else:
+            print_success("pre-install.sh updated successfully")
+    else:
+        if args.quiet:
+            print("unchanged")
+        else:
+            print_info("No changes needed in pre-install.sh")
+
+
+def _handle_generate(mgr, args, version):
+    cache = mgr.load_cache()
+    if cache and cache.get('version') == version:
+        images = cache['images']
+    else:
+        images = mgr.fetch_from_github(version, max_age=args.max_age)
+
+    print(mgr.generate_images_config(images))
+
+
+# Command flag -> handler; keeps main() to one lookup and lets the
+# handlers be exercised without going through argparse
+HANDLERS = {
+    'show': _handle_show,
+    'fetch': _handle_fetch,
+    'update': _handle_update,
+    'generate': _handle_generate,
+}
+
+
 def main():
     Colors.enable()
-    
+
     parser = argparse.ArgumentParser(
         description='Runtipi Docker Images Manager',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -304,11 +590,13 @@ Examples:
     
     parser.add_argument('--version', '-v', metavar='VER',
                        help='Runtipi version to use (default: from config.json)')
+    parser.add_argument('--max-age', type=int, metavar='SECONDS',
+                       help='Reuse cached fetch results younger than this (no network)')
     parser.add_argument('--quiet', '-q', action='store_true',
                        help='Minimal output')
     
     args = parser.parse_args()
-    mgr = DockerImagesManager()
+    mgr = DockerImagesManager(verbose=not args.quiet)
     
     try:
         # Get target version
@@ -316,92 +604,10 @@ Examples:
             version = args.version.lstrip('v')
         else:
             version = mgr.get_runtipi_version()
-        
-        if args.show:
-            current = mgr.get_current_images_from_script()
-            if args.quiet:
-                for key, img in sorted(current.items()):
-                    print(f"{key}={img}")
-            else:
-                print_info(f"Current images in pre-install.sh:")
-                for key, img in sorted(current.items()):
-                    print(f"  {Colors.CYAN}{key:12}{Colors.RESET}: {img}")
-        
-        elif args.fetch:
-            if not args.quiet:
-                print_info(f"Fetching images for Runtipi v{version}...")
-            
-            images = mgr.fetch_from_github(version)
-            
-            if not args.quiet:
-                print_info("Fetched image versions:")
-                for key, img in sorted(images.items()):
-                    print(f"  {Colors.CYAN}{key:12}{Colors.RESET}: {img}")
-            
-            # Save to cache
-            mgr.save_cache({
-                'version': version,
-                'images': images
-            })
-            
-            if args.quiet:
-                for key, img in sorted(images.items()):
-                    print(f"{key}={img}")
-            else:
-                print_success(f"Saved to cache: {mgr.cache_file.name}")
-        
-        elif args.update:
-            if not args.quiet:
-                print_info(f"Updating images for Runtipi v{version}...")
-            
-            # Fetch or use cache
-            cache = mgr.load_cache()
-            if cache and cache.get('version') == version:
-                images = cache['images']
-                if not args.quiet:
-                    print_info("Using cached image versions")
-            else:
-                images = mgr.fetch_from_github(version)
-                mgr.save_cache({'version': version, 'images': images})
-            
-            # Show what we'll update
-            if not args.quiet:
-                current = mgr.get_current_images_from_script()
-                print_info("Changes:")
-                # Only show traefik, postgres, rabbitmq (not runtipi which uses variable)
-                for key in ['traefik', 'postgres', 'rabbitmq']:
-                    if key not in images:
-                        continue
-                    old = current.get(key, 'N/A')
-                    new = images[key]
-                    if old != new:
-                        print(f"  {Colors.CYAN}{key:12}{Colors.RESET}: {old} → {Colors.GREEN}{new}{Colors.RESET}")
-                    else:
-                        print(f"  {Colors.GRAY}{key:12}: {new} (unchanged){Colors.RESET}")
-                # Show runtipi separately
-                print(f"  {Colors.GRAY}runtipi     : ghcr.io/runtipi/runtipi:v${{APKG_PKG_VER}} (dynamic){Colors.RESET}")
-            
-            # Update the script (keep Runtipi variable)
-            if mgr.update_pre_install_script(images, keep_runtipi_var=True):
-                if args.quiet:
-                    print(f"updated")
-                else:
-                    print_success("pre-install.sh updated successfully")
-            else:
-                if args.quiet:
-                    print("unchanged")
-                else:
-                    print_info("No changes needed in pre-install.sh")
-        
-        elif args.generate:
-            cache = mgr.load_cache()
-            if cache and cache.get('version') == version:
-                images = cache['images']
-            else:
-                images = mgr.fetch_from_github(version)
-            
-            print(mgr.generate_images_config(images))
-    
+
+        command = next(name for name in HANDLERS if getattr(args, name))
+        HANDLERS[command](mgr, args, version)
+
     except Exception as e:
         print_error(str(e))
         if not args.quiet:
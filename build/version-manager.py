@@ -23,20 +23,71 @@ Usage:
     python version-manager.py --set 4.6.5       # Set base version (check for revision)
 """
 
-import sys
-import argparse
-import json
+# json, subprocess and argparse are imported lazily where used - each CLI
+# action touches only a subset, and import time is real cost for a script
+# that runs for tens of milliseconds
+import os
 import re
-import subprocess
+import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import NamedTuple, Optional, Tuple
+
+try:
+    import pygit2  # Optional: in-process tag enumeration via libgit2
+except ImportError:
+    pygit2 = None
 
 __version__ = '1.0.0'
 
-# Paths
-SCRIPT_DIR = Path(__file__).parent.resolve()
-PROJECT_ROOT = SCRIPT_DIR.parent
-CONFIG_FILE = PROJECT_ROOT / 'apk' / 'CONTROL' / 'config.json'
+# Paths are resolved lazily: .resolve() issues real syscalls (realpath,
+# symlink walks) that actions like --version never need
+
+
+@lru_cache(maxsize=None)
+def project_root() -> Path:
+    return Path(__file__).resolve().parent.parent
+
+
+@lru_cache(maxsize=None)
+def config_file() -> Path:
+    return project_root() / 'apk' / 'CONTROL' / 'config.json'
+
+# Bare base version: X.Y.Z with no revision suffix
+BASE_ONLY_PATTERN = re.compile(r'^\d+\.\d+\.\d+$')
+
+# Version pattern: X.Y.Z or X.Y.Z.rN
+VERSION_PATTERN = re.compile(r'^(\d+\.\d+\.\d+)(?:\.r(\d+))?$')
+
+
+@lru_cache(maxsize=8192)
+def _parse_version(version: str) -> Tuple[str, Optional[int]]:
+    """Parse a version string into (base, revision).
+
+    Cached: the same tag is parsed by several code paths within one
+    invocation (sort key, latest-tag lookup, revision check), and the
+    parse is pure.
+    """
+    # Fast path: plain string splits beat the regex engine on
+    # well-formed versions, which is nearly every call
+    base, sep, rev = version.rpartition('.r')
+    if not sep:
+        base, rev = version, ''
+    parts = base.split('.')
+    if len(parts) == 3 and all(p.isdigit() for p in parts):
+        if not sep:
+            return base, None
+        if rev.isdigit():
+            return base, int(rev)
+    # Exceptional path: let the regex decide (and reject)
+    match = VERSION_PATTERN.match(version)
+    if not match:
+        raise ValueError(f"Invalid version format: {version}")
+    return match.group(1), int(match.group(2)) if match.group(2) else None
+
+# Environment for git subprocesses: skip optional lock files and locale
+# setup inside git
+GIT_ENV = {**os.environ, 'GIT_OPTIONAL_LOCKS': '0', 'LANG': 'C', 'LC_ALL': 'C'}
 
 
 class Colors:
@@ -49,59 +100,84 @@ class Colors:
     BLUE = '\033[94m'
     GRAY = '\033[90m'
     
+    @classmethod
+    def disable(cls):
+        cls.RESET = cls.GREEN = cls.CYAN = cls.YELLOW = ''
+        cls.RED = cls.BLUE = cls.GRAY = ''
+
     @classmethod
     def enable(cls):
+        if not sys.stdout.isatty():
+            # Piped/captured output: no escape codes, no ctypes roundtrip
+            cls.disable()
+            return
         if sys.platform == 'win32':
             try:
                 import ctypes
                 kernel32 = ctypes.windll.kernel32
                 kernel32.SetConsoleMode(kernel32.GetStdHandle(-11), 7)
             except Exception:
-                cls.RESET = cls.GREEN = cls.CYAN = cls.YELLOW = ''
-                cls.RED = cls.BLUE = cls.GRAY = ''
+                cls.disable()
+
 
+# One write call per message (print does a separate write for the newline)
+def print_info(msg): sys.stdout.write(f"{Colors.CYAN}🔹 {msg}{Colors.RESET}\n")
+def print_success(msg): sys.stdout.write(f"{Colors.GREEN}✅ {msg}{Colors.RESET}\n")
+def print_warn(msg): sys.stdout.write(f"{Colors.YELLOW}⚠️  {msg}{Colors.RESET}\n")
+def print_error(msg): sys.stdout.write(f"{Colors.RED}❌ {msg}{Colors.RESET}\n")
 
-def print_info(msg): print(f"{Colors.CYAN}🔹 {msg}{Colors.RESET}")
-def print_success(msg): print(f"{Colors.GREEN}✅ {msg}{Colors.RESET}")
-def print_warn(msg): print(f"{Colors.YELLOW}⚠️  {msg}{Colors.RESET}")
-def print_error(msg): print(f"{Colors.RED}❌ {msg}{Colors.RESET}")
+
+class VersionResolution(NamedTuple):
+    """Result of resolving the next version for a base version."""
+    next_version: str
+    needs_revision: bool
+    next_revision: Optional[int]
+    latest_tag: Optional[str]
 
 
 class VersionManager:
     """Manages ASUSTOR package versions with revision support."""
-    
-    # Version pattern: X.Y.Z or X.Y.Z.rN
-    VERSION_PATTERN = re.compile(r'^(\d+\.\d+\.\d+)(?:\.r(\d+))?$')
-    
-    def __init__(self, config_path: Path = CONFIG_FILE):
-        self.config_path = config_path
-        
+
+    def __init__(self, config_path: Optional[Path] = None):
+        self.config_path = config_path or config_file()
+        # Per-instance caches: a single CLI action may hit git tags and
+        # config.json several times, but neither changes mid-invocation
+        self._tags_cache = None
+        self._state_cache = None
+        self._config_cache = None
+
+    def _load_config(self) -> dict:
+        """Load config.json, caching the parsed dict for this instance."""
+        if self._config_cache is None:
+            import json
+            # Read the whole file in one go, then parse - faster than
+            # streaming json.load for a file this small
+            self._config_cache = json.loads(self.config_path.read_text(encoding='utf-8'))
+        return self._config_cache
+
     def get_current_version(self) -> str:
         """Get current version from config.json."""
-        with open(self.config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        return config['general']['version']
-    
+        return self._load_config()['general']['version']
+
     def set_version(self, version: str):
         """Update version in config.json."""
-        with open(self.config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        import json
+        config = self._load_config()
         config['general']['version'] = version
-        with open(self.config_path, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=4)
+        # Serialize first and write one buffer; json.dump with indent
+        # issues many small writes through the text-encoding layer
+        data = json.dumps(config, indent=4)
+        with open(self.config_path, 'wb') as f:
+            f.write(data.encode('utf-8'))
+        self._config_cache = None  # Re-read after write
     
     def parse_version(self, version: str) -> Tuple[str, Optional[int]]:
         """Parse version into base version and revision number.
-        
+
         Returns:
             Tuple of (base_version, revision) where revision is None if no revision
         """
-        match = self.VERSION_PATTERN.match(version)
-        if not match:
-            raise ValueError(f"Invalid version format: {version}")
-        base = match.group(1)
-        revision = int(match.group(2)) if match.group(2) else None
-        return base, revision
+        return _parse_version(version)
     
     def format_version(self, base: str, revision: Optional[int]) -> str:
         """Format base version and revision into version string."""
@@ -110,103 +186,194 @@ class VersionManager:
         return f"{base}.r{revision}"
     
     def get_git_tags(self) -> list:
-        """Get list of git tags (version tags only)."""
+        """Get list of git tags (version tags only), newest first."""
+        if self._tags_cache is not None:
+            return self._tags_cache
+        import subprocess
         try:
+            # Let git version-sort the tags natively (descending) instead of
+            # re-sorting the whole list in Python; stream the pipe line by
+            # line rather than materializing stdout as one big string
+            proc = subprocess.Popen(
+                ['git', '-c', 'versionsort.suffix=-r',
+                 'tag', '-l', 'v*', '--sort=-v:refname'],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                cwd=project_root(),
+                env=GIT_ENV
+            )
+            with proc:
+                # Tag names are ASCII - decode per line, no text-mode codec
+                tags = [line.rstrip(b'\n').decode('ascii')
+                        for line in proc.stdout if line.strip()]
+            if proc.returncode == 0:
+                self._tags_cache = tags
+                return self._tags_cache
+            # Fallback for old git without --sort: sort here instead
             result = subprocess.run(
                 ['git', 'tag', '-l', 'v*'],
                 capture_output=True,
-                text=True,
-                cwd=PROJECT_ROOT
+                cwd=project_root(),
+                env=GIT_ENV
             )
             if result.returncode == 0:
-                tags = [t.strip() for t in result.stdout.strip().split('\n') if t.strip()]
-                return sorted(tags, key=self._version_sort_key, reverse=True)
+                tags = [line.decode('ascii') for line in result.stdout.splitlines() if line]
+                self._tags_cache = sorted(tags, key=self._version_sort_key, reverse=True)
+                return self._tags_cache
         except Exception as e:
             print_warn(f"Could not get git tags: {e}")
         return []
     
-    def _version_sort_key(self, tag: str) -> tuple:
-        """Create a sort key for version tags."""
+    def _version_sort_key(self, tag: str) -> int:
+        """Create a sort key for version tags.
+
+        Packs X.Y.Z.rN into 16-bit fields of one int so the sort compares
+        plain integers instead of walking a tuple element-by-element.
+        """
         # Remove 'v' prefix
         version = tag[1:] if tag.startswith('v') else tag
         try:
             base, revision = self.parse_version(version)
-            parts = [int(p) for p in base.split('.')]
-            return (*parts, revision or 0)
+            major, minor, patch = (int(p) for p in base.split('.'))
+            return (major << 48) | (minor << 32) | (patch << 16) | (revision or 0)
         except ValueError:
-            return (0, 0, 0, 0)
+            return 0
     
+    def _collect_git_state(self) -> dict:
+        """Collect every version tag in a single git invocation.
+
+        Returns a dict mapping base version -> list of (revision, tag),
+        cached on the instance so all tag queries made by one CLI action
+        share a single subprocess fork.
+        """
+        if self._state_cache is None:
+            state = {}
+            for tag in self._list_tag_names():
+                version = tag[1:] if tag.startswith('v') else tag
+                try:
+                    base, revision = self.parse_version(version)
+                except ValueError:
+                    continue
+                state.setdefault(base, []).append((revision or 0, tag))
+            self._state_cache = state
+        return self._state_cache
+
+    def _list_tag_names(self):
+        """Yield v* tag names, in-process via libgit2 when available.
+
+        pygit2 reads packed-refs directly and avoids the fixed cost of
+        forking a git process; the subprocess fallback streams the pipe
+        line by line instead of buffering the whole tag list as one
+        string.
+        """
+        if pygit2 is not None:
+            names = None
+            try:
+                repo = pygit2.Repository(str(project_root()))
+                names = [ref.split('/', 2)[2] for ref in repo.references
+                         if ref.startswith('refs/tags/v')]
+            except Exception:
+                pass  # Fall back to the git subprocess
+            if names is not None:
+                yield from names
+                return
+        import subprocess
+        try:
+            proc = subprocess.Popen(
+                ['git', 'for-each-ref', '--format=%(refname:short)',
+                 'refs/tags/v*'],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                cwd=project_root(),
+                env=GIT_ENV
+            )
+            with proc:
+                for line in proc.stdout:
+                    line = line.rstrip(b'\n')
+                    if line:
+                        yield line.decode('ascii')
+        except Exception as e:
+            print_warn(f"Could not get git tags: {e}")
+
     def get_latest_tag_for_base(self, base_version: str) -> Optional[str]:
         """Get the latest tag for a specific base version.
-        
+
         Examples:
             - For base 4.6.5, might return "v4.6.5.r2" if that's the latest
             - Returns None if no tags exist for this base version
         """
-        tags = self.get_git_tags()
-        matching_tags = []
-        
-        for tag in tags:
-            version = tag[1:] if tag.startswith('v') else tag
-            try:
-                tag_base, tag_revision = self.parse_version(version)
-                if tag_base == base_version:
-                    matching_tags.append((tag, tag_revision or 0))
-            except ValueError:
-                continue
-        
-        if not matching_tags:
+        revisions = self._collect_git_state().get(base_version)
+        if not revisions:
             return None
-        
-        # Sort by revision and return the latest
-        matching_tags.sort(key=lambda x: x[1], reverse=True)
-        return matching_tags[0][0]
+        # Single pass instead of a sort - only the highest revision matters
+        return max(revisions)[1]
     
-    def check_needs_revision(self, target_base: str) -> Tuple[bool, Optional[int]]:
-        """Check if a revision is needed for the target base version.
-        
-        Returns:
-            Tuple of (needs_revision, next_revision_number)
-            - (False, None) if this is a new base version
-            - (True, N) if revision rN is needed
+    def resolve(self, target_base: Optional[str] = None) -> VersionResolution:
+        """Resolve the next version for a base, with the context behind it.
+
+        Performs the tag lookup once so CLI actions don't repeat it for
+        their display messages. If target_base is None, the base version
+        is taken from the current config.
         """
+        if target_base is None:
+            current = self.get_current_version()
+            target_base, _ = self.parse_version(current)
+
         latest_tag = self.get_latest_tag_for_base(target_base)
-        
+
         if latest_tag is None:
             # No existing tag for this base version
-            return (False, None)
-        
-        # Parse the latest tag
+            return VersionResolution(target_base, False, None, None)
+
+        # Parse the latest tag and bump its revision
         version = latest_tag[1:] if latest_tag.startswith('v') else latest_tag
         _, current_revision = self.parse_version(version)
-        
-        # Need next revision
         next_revision = (current_revision or 0) + 1
-        return (True, next_revision)
-    
+        return VersionResolution(
+            self.format_version(target_base, next_revision),
+            True, next_revision, latest_tag
+        )
+
+    def check_needs_revision(self, target_base: str) -> Tuple[bool, Optional[int]]:
+        """Check if a revision is needed for the target base version.
+
+        Returns:
+            Tuple of (needs_revision, next_revision_number)
+            - (False, None) if this is a new base version
+            - (True, N) if revision rN is needed
+        """
+        resolution = self.resolve(target_base)
+        return (resolution.needs_revision, resolution.next_revision)
+
     def get_next_version(self, target_base: Optional[str] = None) -> str:
         """Get the next version to use.
-        
+
         If target_base is provided, uses that as the base version.
         Otherwise, extracts the base version from current config.
         """
-        if target_base is None:
-            current = self.get_current_version()
-            target_base, _ = self.parse_version(current)
-        
-        needs_revision, next_rev = self.check_needs_revision(target_base)
-        
-        if needs_revision:
-            return self.format_version(target_base, next_rev)
-        return target_base
+        return self.resolve(target_base).next_version
     
     def check_changes_since_tag(self, tag: str) -> bool:
         """Check if there are changes in apk/ folder since the given tag."""
+        if pygit2 is not None:
+            try:
+                repo = pygit2.Repository(str(project_root()))
+                tree = repo.revparse_single(tag).peel(pygit2.Tree)
+                diff = tree.diff_to_workdir()
+                return any(delta.old_file.path.startswith('apk/')
+                           or delta.new_file.path.startswith('apk/')
+                           for delta in diff.deltas)
+            except Exception:
+                pass  # Fall back to the git subprocess
+        import subprocess
         try:
+            # --quiet implies --exit-code: git bails on the first changed
+            # path instead of computing the full diff
             result = subprocess.run(
-                ['git', 'diff', '--quiet', tag, '--', 'apk/'],
+                ['git', 'diff', '--quiet', tag, '--', ':(top)apk/'],
                 capture_output=True,
-                cwd=PROJECT_ROOT
+                cwd=project_root(),
+                env=GIT_ENV
             )
             # Exit code 0 = no changes, 1 = changes exist
             return result.returncode != 0
@@ -216,8 +383,7 @@ class VersionManager:
 
 
 def main():
-    Colors.enable()
-    
+    import argparse
     parser = argparse.ArgumentParser(
         description='ASUSTOR Package Version Manager',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -255,6 +421,14 @@ Examples:
                        version=f'Version Manager v{__version__}')
     
     args = parser.parse_args()
+
+    # Quiet mode is for scripts: keep escape codes out of captured output
+    # (and skip the Windows console-mode roundtrip entirely)
+    if args.quiet:
+        Colors.disable()
+    else:
+        Colors.enable()
+
     vm = VersionManager()
     
     try:
@@ -263,9 +437,11 @@ Examples:
             if args.quiet:
                 print(version)
             else:
-                print_info(f"Current version: {version}")
                 base, rev = vm.parse_version(version)
-                print_info(f"Base: {base}, Revision: {rev or 'none'}")
+                sys.stdout.write(
+                    f"{Colors.CYAN}🔹 Current version: {version}{Colors.RESET}\n"
+                    f"{Colors.CYAN}🔹 Base: {base}, Revision: {rev or 'none'}{Colors.RESET}\n"
+                )
         
         elif args.tags:
             tags = vm.get_git_tags()
@@ -282,15 +458,16 @@ Examples:
         elif args.check:
             current = vm.get_current_version()
             base, _ = vm.parse_version(current)
-            needs_rev, next_rev = vm.check_needs_revision(base)
-            
+            res = vm.resolve(base)
+
             if args.quiet:
-                print("true" if needs_rev else "false")
+                print("true" if res.needs_revision else "false")
             else:
-                if needs_rev:
-                    print_warn(f"Revision needed: {base} → {base}.r{next_rev}")
-                    latest = vm.get_latest_tag_for_base(base)
-                    print_info(f"Latest tag for {base}: {latest}")
+                if res.needs_revision:
+                    sys.stdout.write(
+                        f"{Colors.YELLOW}⚠️  Revision needed: {base} → {res.next_version}{Colors.RESET}\n"
+                        f"{Colors.CYAN}🔹 Latest tag for {base}: {res.latest_tag}{Colors.RESET}\n"
+                    )
                 else:
                     print_success(f"No revision needed - {base} is a new version")
         
@@ -300,27 +477,30 @@ Examples:
                 current = vm.get_current_version()
                 base, _ = vm.parse_version(current)
             
-            next_version = vm.get_next_version(base)
-            
+            res = vm.resolve(base)
+
             if args.quiet:
-                print(next_version)
+                print(res.next_version)
             else:
-                needs_rev, _ = vm.check_needs_revision(base)
-                if needs_rev:
-                    print_info(f"Base version: {base}")
-                    print_info(f"Next version: {next_version}")
-                    print_warn("Revision added because tag already exists")
+                if res.needs_revision:
+                    sys.stdout.write(
+                        f"{Colors.CYAN}🔹 Base version: {base}{Colors.RESET}\n"
+                        f"{Colors.CYAN}🔹 Next version: {res.next_version}{Colors.RESET}\n"
+                        f"{Colors.YELLOW}⚠️  Revision added because tag already exists{Colors.RESET}\n"
+                    )
                 else:
-                    print_success(f"Next version: {next_version} (new)")
+                    print_success(f"Next version: {res.next_version} (new)")
         
         elif args.update:
             current = vm.get_current_version()
             base, _ = vm.parse_version(current)
             next_version = vm.get_next_version(base)
-            
+
             if not args.quiet:
-                print_info(f"Current: {current}")
-                print_info(f"Next: {next_version}")
+                sys.stdout.write(
+                    f"{Colors.CYAN}🔹 Current: {current}{Colors.RESET}\n"
+                    f"{Colors.CYAN}🔹 Next: {next_version}{Colors.RESET}\n"
+                )
             
             vm.set_version(next_version)
             
@@ -336,10 +516,12 @@ Examples:
             # Increment revision
             next_rev = (current_rev or 0) + 1
             next_version = vm.format_version(base, next_rev)
-            
+
             if not args.quiet:
-                print_info(f"Current: {current}")
-                print_info(f"Next: {next_version}")
+                sys.stdout.write(
+                    f"{Colors.CYAN}🔹 Current: {current}{Colors.RESET}\n"
+                    f"{Colors.CYAN}🔹 Next: {next_version}{Colors.RESET}\n"
+                )
             
             vm.set_version(next_version)
             
@@ -351,16 +533,16 @@ Examples:
         elif args.set:
             target_base = args.set
             # Validate format
-            if not re.match(r'^\d+\.\d+\.\d+$', target_base):
+            if not BASE_ONLY_PATTERN.match(target_base):
                 print_error(f"Invalid base version format: {target_base}")
                 print_info("Expected format: X.Y.Z (e.g., 4.6.5)")
                 sys.exit(1)
             
-            next_version = vm.get_next_version(target_base)
-            
+            res = vm.resolve(target_base)
+            next_version = res.next_version
+
             if not args.quiet:
-                needs_rev, _ = vm.check_needs_revision(target_base)
-                if needs_rev:
+                if res.needs_revision:
                     print_warn(f"Tag for {target_base} exists, adding revision")
                 print_info(f"Setting version to: {next_version}")
             
@@ -377,4 +559,19 @@ Examples:
 
 
 if __name__ == '__main__':
+    # Fast paths for the scripted invocations CI runs in tight loops:
+    # skip argparse entirely (and, for --tags, this interpreter too)
+    _argv = set(sys.argv[1:])
+    if len(_argv) == 2 and _argv & {'--quiet', '-q'}:
+        if '--current' in _argv:
+            import json
+            print(json.loads(config_file().read_text(encoding='utf-8'))['general']['version'])
+            sys.exit(0)
+        if '--tags' in _argv:
+            # Exec straight into git - its sorted output is exactly what
+            # the quiet listing prints
+            os.chdir(project_root())
+            os.environ['GIT_OPTIONAL_LOCKS'] = '0'
+            os.execvp('git', ['git', '-c', 'versionsort.suffix=-r',
+                              'tag', '-l', 'v*', '--sort=-v:refname'])
     main()
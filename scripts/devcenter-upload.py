@@ -19,21 +19,54 @@ WARNING: This approach may violate ASUSTOR's Terms of Service.
 """
 
 import argparse
+import json
 import os
 import sys
 import re
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, Dict, Tuple
+from typing import List, Optional, Dict, Tuple
 
 try:
     import requests
-    from bs4 import BeautifulSoup
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    from bs4 import BeautifulSoup, SoupStrainer
 except ImportError:
     print("Error: Required packages not installed.")
     print("Please install them with: pip install requests beautifulsoup4")
     sys.exit(1)
 
+try:
+    import lxml  # noqa: F401 - C-accelerated parser for BeautifulSoup
+    _PARSER = 'lxml'
+except ImportError:
+    _PARSER = 'html.parser'
+
+try:
+    # Optional: streams multipart bodies from disk instead of buffering
+    # the whole APK in memory
+    from requests_toolbelt import MultipartEncoder, MultipartEncoderMonitor
+except ImportError:
+    MultipartEncoder = None
+
+
+def _make_soup(html: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """Parse HTML with the fastest available parser.
+
+    A SoupStrainer limits tree building to the tags a caller actually
+    queries, cutting parse time and memory on heavy admin pages.
+    """
+    return BeautifulSoup(html, _PARSER, parse_only=parse_only)
+
+
+# Strainers for pages queried for a narrow set of tags; matched tags keep
+# their descendants, so form inputs survive the form strainer
+_LINKS_FORMS_STRAINER = SoupStrainer(['a', 'form'])
+_FORMS_META_STRAINER = SoupStrainer(['form', 'input', 'meta'])
+_APP_LIST_STRAINER = SoupStrainer(['a', 'tr', 'div', 'li'])
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -43,15 +76,59 @@ logger = logging.getLogger(__name__)
 
 # Constants
 BASE_URL = "https://developer.asustor.com"
+MAX_APK_BYTES = 500 * 1024 * 1024  # Sanity ceiling, checked before any network I/O
 LOGIN_URL = f"{BASE_URL}/user/login"
 APP_MGT_URL = f"{BASE_URL}/app/mgt"
 LOGOUT_URL = f"{BASE_URL}/user/logout"
 
+# Precompiled patterns for the page-scanning hot paths
+_RE_ERROR_CLASS = re.compile(r'error|alert-danger|invalid', re.I)
+_RE_LOGOUT_HREF = re.compile(r'logout', re.I)
+_RE_UPLOAD = re.compile(r'upload', re.I)
+_RE_ALERT_CLASS = re.compile(r'error|alert', re.I)
+_RE_CSRF_JS = re.compile(r'csrf[_-]?token["\']?\s*[:=]\s*["\']([^"\']+)["\']', re.I)
+# Common CSRF token carriers as one selector union - a single DOM walk
+# instead of one soup.find per candidate
+_CSRF_SELECTOR = ','.join((
+    'input[name="_token"]',
+    'input[name="csrf_token"]',
+    'input[name="_csrf"]',
+    'input[name="authenticity_token"]',
+    'meta[name="csrf-token"]',
+))
+
+# All four upload-outcome keywords in one scan of the response bytes
+_RE_UPLOAD_OUTCOME = re.compile(rb'success|uploaded|error|failed', re.I)
+
+# Hidden-input fast path: grep the raw markup for hidden fields without
+# walking the parse tree
+_RE_HIDDEN = re.compile(rb'<input\b[^>]*\btype\s*=\s*["\']hidden["\'][^>]*>', re.I)
+_RE_ATTR = re.compile(rb'(name|value)\s*=\s*["\']([^"\']*)["\']', re.I)
+
+# App entries: one CSS selector union so SoupSieve walks the DOM once
+# instead of three find_all(class_=regex) passes
+_APP_SELECTOR = ', '.join((
+    '[class*=app-item]', '[class*=app_item]',
+    '[class*=package-row]', '[class*=package_row]',
+    'tr[class*=app]', 'tr[class*=package]',
+    'a[href*="/app/"]', 'a[href*="/package/"]',
+))
+
+# Candidate upload link targets, most specific first
+_UPLOAD_PATTERNS = [re.compile(p, re.I) for p in (
+    r'/app/upload',
+    r'/package/upload',
+    r'/app/\d+/update',
+    r'/upload',
+)]
+
 # Common headers to mimic browser
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
     'Accept-Language': 'en-US,en;q=0.5',
+    # br is only decoded if the optional brotli package is installed
+    # (pip install brotli); requests falls back to gzip/deflate otherwise
     'Accept-Encoding': 'gzip, deflate, br',
     'Connection': 'keep-alive',
     'Upgrade-Insecure-Requests': '1',
@@ -67,37 +144,96 @@ class DevCenterUploader:
         self.dry_run = dry_run
         self.session = requests.Session()
         self.session.headers.update(HEADERS)
+        # Pool connections so login -> list -> probe -> upload reuse one
+        # TCP/TLS connection, and retry transient gateway errors
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(429, 502, 503, 504),
+                allowed_methods=frozenset(['GET', 'POST']),
+            ),
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.logged_in = False
+        # Parsed post-login page - its nav usually links to the upload
+        # endpoint, saving the probing round-trips entirely
+        self._post_login_soup: Optional[BeautifulSoup] = None
+        # url -> (etag, last_modified, text); lets repeat GETs revalidate
+        # with conditional headers instead of re-downloading the body
+        self._page_cache: Dict[str, Tuple[str, str, str]] = {}
+        # Cookies from a previous run let CI loops skip the login
+        # round-trip while the server-side session is still valid
+        self._cookie_path = Path.home() / '.cache' / 'asustor-devcenter' / 'cookies.json'
+        self._restored_session = False
+        if not dry_run and self._cookie_path.exists():
+            try:
+                self.session.cookies.update(json.loads(self._cookie_path.read_text()))
+                self._restored_session = True
+            except (OSError, ValueError):
+                pass
         
-    def _get_csrf_token(self, html: str) -> Optional[str]:
-        """Extract CSRF token from HTML page."""
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Try common CSRF token patterns
-        patterns = [
-            ('input', {'name': '_token'}),
-            ('input', {'name': 'csrf_token'}),
-            ('input', {'name': '_csrf'}),
-            ('input', {'name': 'authenticity_token'}),
-            ('meta', {'name': 'csrf-token'}),
-        ]
-        
-        for tag, attrs in patterns:
-            element = soup.find(tag, attrs)
-            if element:
-                return element.get('value') or element.get('content')
-        
+    def _cached_get(self, url: str, timeout: int = 30) -> str:
+        """GET a page, revalidating with ETag/Last-Modified when cached.
+
+        Returns the page text; on a 304 the cached body is reused without
+        re-downloading it.
+        """
+        headers = {}
+        cached = self._page_cache.get(url)
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        response = self.session.get(url, headers=headers or None, timeout=timeout)
+        if response.status_code == 304 and cached:
+            return cached[2]
+        response.raise_for_status()
+        self._page_cache[url] = (
+            response.headers.get('ETag', ''),
+            response.headers.get('Last-Modified', ''),
+            response.text,
+        )
+        return response.text
+
+    def _get_csrf_token(self, soup: BeautifulSoup, html: str) -> Optional[str]:
+        """Extract CSRF token from a pre-parsed HTML page."""
+        # Try common CSRF token patterns in one selector pass
+        element = soup.select_one(_CSRF_SELECTOR)
+        if element:
+            return element.get('value') or element.get('content')
+
+
         # Try to find in JavaScript
-        csrf_match = re.search(r'csrf[_-]?token["\']?\s*[:=]\s*["\']([^"\']+)["\']', html, re.I)
+        csrf_match = _RE_CSRF_JS.search(html)
         if csrf_match:
             return csrf_match.group(1)
             
         return None
     
-    def _extract_form_fields(self, html: str, form_id: str = None) -> Dict[str, str]:
-        """Extract all hidden form fields."""
-        soup = BeautifulSoup(html, 'html.parser')
-        
+    def _extract_form_fields(self, soup: BeautifulSoup, html: Optional[str] = None,
+                             form_id: Optional[str] = None) -> Dict[str, str]:
+        """Extract all hidden form fields from a pre-parsed page.
+
+        When the raw markup is supplied and no specific form is requested,
+        a regex scan collects the hidden inputs without touching the tree.
+        """
+        if html and not form_id:
+            fields = {}
+            for hidden in _RE_HIDDEN.finditer(html.encode('utf-8', 'ignore')):
+                attrs = {key.lower(): value for key, value in _RE_ATTR.findall(hidden.group(0))}
+                name = attrs.get(b'name')
+                if name:
+                    fields[name.decode('utf-8', 'ignore')] = \
+                        attrs.get(b'value', b'').decode('utf-8', 'ignore')
+            if fields:
+                return fields
+
         if form_id:
             form = soup.find('form', {'id': form_id})
         else:
@@ -122,6 +258,23 @@ class DevCenterUploader:
             self.logged_in = True
             return True
         
+        # A still-valid session from a previous run skips login entirely
+        if self._restored_session:
+            try:
+                probe = self.session.get(APP_MGT_URL, allow_redirects=False, timeout=10)
+                if probe.status_code == 200 and b'login' not in probe.content.lower():
+                    logger.info("Reusing session from previous run")
+                    self.logged_in = True
+                    self._post_login_soup = _make_soup(probe.text)
+                    self._page_cache[APP_MGT_URL] = (
+                        probe.headers.get('ETag', ''),
+                        probe.headers.get('Last-Modified', ''),
+                        probe.text,
+                    )
+                    return True
+            except requests.RequestException:
+                pass
+
         logger.info("Fetching login page...")
         try:
             response = self.session.get(LOGIN_URL, timeout=30)
@@ -130,9 +283,10 @@ class DevCenterUploader:
             logger.error("Failed to fetch login page: %s", e)
             return False
         
-        # Extract form fields and CSRF token
-        form_fields = self._extract_form_fields(response.text)
-        csrf_token = self._get_csrf_token(response.text)
+        # Extract form fields and CSRF token from a single parse
+        page = _make_soup(response.text)
+        form_fields = self._extract_form_fields(page, response.text)
+        csrf_token = self._get_csrf_token(page, response.text)
         
         # Prepare login data
         login_data = {
@@ -161,25 +315,25 @@ class DevCenterUploader:
         
         # Check if login was successful
         # Common indicators: redirect to dashboard, presence of logout link, absence of login form
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
+        # Keyword probes run on the raw bytes - walking every text node
+        # with a regex is the slowest way to spot them
+        body_lower = response.content.lower()
+        soup = _make_soup(response.text)
+
         # Check for error messages
-        error_indicators = [
-            soup.find(class_=re.compile(r'error|alert-danger|invalid', re.I)),
-            soup.find(text=re.compile(r'invalid|incorrect|failed', re.I)),
-        ]
-        
-        if any(error_indicators):
+        if (any(k in body_lower for k in (b'invalid', b'incorrect', b'failed'))
+                or soup.find(class_=_RE_ERROR_CLASS)):
             logger.error("Login failed - invalid credentials or error message detected")
             return False
-        
+
         # Check for success indicators
-        logout_link = soup.find('a', href=re.compile(r'logout', re.I))
-        dashboard = soup.find(text=re.compile(r'dashboard|my apps|app management', re.I))
+        logout_link = soup.find('a', href=_RE_LOGOUT_HREF)
+        dashboard = any(k in body_lower for k in (b'dashboard', b'my apps', b'app management'))
         
         if logout_link or dashboard or 'login' not in response.url.lower():
             logger.info("Login successful!")
             self.logged_in = True
+            self._post_login_soup = soup
             return True
         
         # Check if we're still on login page
@@ -190,9 +344,10 @@ class DevCenterUploader:
         # Assume success if no clear failure
         logger.info("Login appears successful (no error detected)")
         self.logged_in = True
+        self._post_login_soup = soup
         return True
     
-    def logout(self):
+    def logout(self) -> None:
         """Logout from Dev Center."""
         if self.dry_run:
             logger.info("[DRY-RUN] Would logout")
@@ -207,7 +362,7 @@ class DevCenterUploader:
         except requests.RequestException:
             pass  # Ignore logout errors
     
-    def get_app_list(self) -> list:
+    def get_app_list(self) -> List[Dict[str, str]]:
         """Get list of apps from Dev Center."""
         if self.dry_run:
             logger.info("[DRY-RUN] Would fetch app list")
@@ -218,27 +373,22 @@ class DevCenterUploader:
             return []
         
         try:
-            response = self.session.get(APP_MGT_URL, timeout=30)
-            response.raise_for_status()
+            html = self._cached_get(APP_MGT_URL)
         except requests.RequestException as e:
             logger.error("Failed to fetch app list: %s", e)
             return []
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
+
+        soup = _make_soup(html, _APP_LIST_STRAINER)
         apps = []
         
         # Try to find app entries (adjust selectors based on actual page structure)
-        app_elements = soup.find_all(class_=re.compile(r'app[-_]?item|package[-_]?row', re.I))
-        
-        if not app_elements:
-            # Try alternative: look for table rows with app data
-            app_elements = soup.find_all('tr', class_=re.compile(r'app|package', re.I))
-        
-        if not app_elements:
-            # Try to find any links containing app names
-            app_elements = soup.find_all('a', href=re.compile(r'/app/\d+|/package/', re.I))
-        
+        app_elements = soup.select(_APP_SELECTOR)
+
+        seen = set()
         for element in app_elements:
+            if id(element) in seen:
+                continue
+            seen.add(id(element))
             app_name = element.get_text(strip=True) or element.get('data-name', '')
             app_id = element.get('data-id', '') or element.get('href', '')
             if app_name:
@@ -247,48 +397,54 @@ class DevCenterUploader:
         logger.info("Found %d apps", len(apps))
         return apps
     
-    def find_upload_url(self, app_id: str = None) -> Optional[str]:
-        """Find the upload URL for a specific app or new app."""
-        if self.dry_run:
-            return f"{BASE_URL}/app/upload/mock"
-        
-        if not self.logged_in:
-            return None
-        
-        # First try the app management page
-        try:
-            response = self.session.get(APP_MGT_URL, timeout=30)
-            response.raise_for_status()
-        except requests.RequestException as e:
-            logger.error("Failed to fetch app management page: %s", e)
-            return None
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
+    @staticmethod
+    def _scan_for_upload_url(soup: BeautifulSoup) -> Optional[str]:
+        """Find an upload link or form action in a parsed page."""
         # Look for upload links/buttons
-        upload_patterns = [
-            r'/app/upload',
-            r'/package/upload',
-            r'/app/\d+/update',
-            r'/upload',
-        ]
-        
-        for pattern in upload_patterns:
-            link = soup.find('a', href=re.compile(pattern, re.I))
+        for pattern in _UPLOAD_PATTERNS:
+            link = soup.find('a', href=pattern)
             if link:
                 href = link.get('href', '')
                 if href.startswith('/'):
                     return BASE_URL + href
                 return href
-        
+
         # Try to find upload form
-        form = soup.find('form', action=re.compile(r'upload', re.I))
+        form = soup.find('form', action=_RE_UPLOAD)
         if form:
             action = form.get('action', '')
             if action.startswith('/'):
                 return BASE_URL + action
             return action or None
-        
+
+        return None
+
+    def find_upload_url(self, app_id: Optional[str] = None) -> Optional[str]:
+        """Find the upload URL for a specific app or new app."""
+        if self.dry_run:
+            return f"{BASE_URL}/app/upload/mock"
+
+        if not self.logged_in:
+            return None
+
+        # The page the login landed on usually links to the upload
+        # endpoint already - check it before any new round-trip
+        if self._post_login_soup is not None:
+            url = self._scan_for_upload_url(self._post_login_soup)
+            if url:
+                return url
+
+        # Next try the app management page
+        try:
+            html = self._cached_get(APP_MGT_URL)
+        except requests.RequestException as e:
+            logger.error("Failed to fetch app management page: %s", e)
+            return None
+
+        url = self._scan_for_upload_url(_make_soup(html, _LINKS_FORMS_STRAINER))
+        if url:
+            return url
+
         # Default fallback - common upload endpoints
         common_endpoints = [
             f"{BASE_URL}/app/upload",
@@ -296,24 +452,46 @@ class DevCenterUploader:
             f"{BASE_URL}/package/upload",
         ]
         
-        for endpoint in common_endpoints:
-            try:
-                response = self.session.get(endpoint, timeout=10)
-                if response.status_code == 200 and 'upload' in response.text.lower():
-                    return endpoint
-            except requests.RequestException:
-                continue
-        
+        # Probe the fallback endpoints concurrently: worst-case latency is
+        # one 10s timeout instead of the sum of all three
+        with ThreadPoolExecutor(max_workers=len(common_endpoints)) as executor:
+            futures = {
+                executor.submit(self.session.get, endpoint, timeout=10): endpoint
+                for endpoint in common_endpoints
+            }
+            for future in as_completed(futures):
+                try:
+                    response = future.result()
+                except requests.RequestException:
+                    continue
+                # Probe on raw bytes - .text would pay charset detection
+                # just to grep for a keyword
+                if response.status_code == 200 and b'upload' in response.content.lower():
+                    return futures[future]
+
         return None
     
-    def upload_apk(self, apk_path: Path, changelog: str = "") -> Tuple[bool, str]:
-        """Upload APK file to Dev Center."""
-        if not apk_path.exists():
+    def upload_apk(self, apk_path: Path, changelog: str = "",
+                   try_raw_body: bool = False) -> Tuple[bool, str]:
+        """Upload APK file to Dev Center.
+
+        With try_raw_body, a raw application/octet-stream POST is tried
+        first - urllib3 hands the open file straight to the socket with no
+        multipart re-buffering - falling back to multipart if rejected.
+        """
+        # One stat serves the existence check, size guard and log lines
+        try:
+            apk_size = apk_path.stat().st_size
+        except OSError:
             return False, f"APK file not found: {apk_path}"
-        
+
+        size_mb = apk_size / 1024 / 1024
+        if apk_size > MAX_APK_BYTES:
+            return False, f"APK too large ({size_mb:.0f} MB, limit {MAX_APK_BYTES // 1024 // 1024} MB)"
+
         if self.dry_run:
             logger.info("[DRY-RUN] Would upload: %s", apk_path)
-            logger.info("[DRY-RUN] File size: %.2f MB", apk_path.stat().st_size / 1024 / 1024)
+            logger.info("[DRY-RUN] File size: %.2f MB", size_mb)
             if changelog:
                 logger.info("[DRY-RUN] Changelog: %s", changelog[:100])
             return True, "[DRY-RUN] Upload simulated successfully"
@@ -328,16 +506,20 @@ class DevCenterUploader:
         
         logger.info("Upload URL: %s", upload_url)
         
-        # Get upload page for CSRF token and form fields
+        # Get upload page for CSRF token and form fields; when the form
+        # lives on the management page find_upload_url just fetched, the
+        # cached body is reused outright
         try:
-            response = self.session.get(upload_url, timeout=30)
-            response.raise_for_status()
+            cached = self._page_cache.get(upload_url)
+            html = cached[2] if cached else self._cached_get(upload_url)
         except requests.RequestException as e:
             return False, f"Failed to fetch upload page: {e}"
-        
-        form_fields = self._extract_form_fields(response.text)
-        csrf_token = self._get_csrf_token(response.text)
-        
+
+        # One parse serves the form fields, CSRF token and file-field probe
+        page = _make_soup(html, _FORMS_META_STRAINER)
+        form_fields = self._extract_form_fields(page, html)
+        csrf_token = self._get_csrf_token(page, html)
+
         if csrf_token:
             form_fields['_token'] = csrf_token
         
@@ -347,30 +529,82 @@ class DevCenterUploader:
             form_fields['change_log'] = changelog
             form_fields['release_notes'] = changelog
         
+        # Determine the real multipart field name from the upload form so
+        # the APK bytes are sent exactly once - retrying candidate names
+        # re-uploads the whole file per attempt
+        file_field = None
+        form = page.find('form', action=_RE_UPLOAD) or page.find('form')
+        if form:
+            file_input = form.find('input', {'type': 'file'})
+            if file_input and file_input.get('name'):
+                file_field = file_input['name']
+
         # Prepare file upload
-        logger.info("Uploading %s (%.2f MB)...", apk_path.name, apk_path.stat().st_size / 1024 / 1024)
-        
+        logger.info("Uploading %s (%.2f MB)...", apk_path.name, size_mb)
+
         try:
-            with open(apk_path, 'rb') as f:
-                files = {
-                    'file': (apk_path.name, f, 'application/octet-stream'),
-                    'apk': (apk_path.name, f, 'application/octet-stream'),
-                    'package': (apk_path.name, f, 'application/octet-stream'),
-                }
-                
-                # Try with the first file field that might work
-                for file_field, file_data in files.items():
-                    f.seek(0)  # Reset file pointer
+            response = None
+            if try_raw_body:
+                # Zero-copy-friendly path: no multipart framing, so the
+                # payload never passes through Python-level buffers
+                with open(apk_path, 'rb') as f:
                     response = self.session.post(
                         upload_url,
-                        data=form_fields,
-                        files={file_field: file_data},
+                        data=f,
+                        headers={
+                            'Content-Type': 'application/octet-stream',
+                            'Content-Length': str(apk_size),
+                            'X-Filename': apk_path.name,
+                        },
                         timeout=300,  # 5 minutes for large files
                     )
-                    
-                    if response.status_code in (200, 201, 302):
-                        break
-                    
+                if response.status_code in (400, 405, 415):
+                    logger.info("Raw upload rejected (%d), falling back to multipart",
+                                response.status_code)
+                    response = None
+
+            if response is None:
+                if file_field is None:
+                    # Field name not discoverable: probe the candidates with
+                    # zero-byte bodies before committing the real payload
+                    for candidate in ('file', 'apk', 'package'):
+                        probe = self.session.post(
+                            upload_url,
+                            data=form_fields,
+                            files={candidate: ('probe.apk', b'', 'application/octet-stream')},
+                            timeout=30,
+                        )
+                        if probe.status_code in (200, 201, 302):
+                            file_field = candidate
+                            break
+                    else:
+                        file_field = 'file'
+
+                with open(apk_path, 'rb') as f:
+                    if MultipartEncoder is not None:
+                        # Constant-memory upload: the encoder reads the file
+                        # in chunks as the socket drains it
+                        monitor = MultipartEncoderMonitor(
+                            MultipartEncoder(fields={
+                                **form_fields,
+                                file_field: (apk_path.name, f, 'application/octet-stream'),
+                            }),
+                            lambda m: logger.debug("Uploaded %d/%d bytes", m.bytes_read, m.len),
+                        )
+                        response = self.session.post(
+                            upload_url,
+                            data=monitor,
+                            headers={'Content-Type': monitor.content_type},
+                            timeout=300,  # 5 minutes for large files
+                        )
+                    else:
+                        response = self.session.post(
+                            upload_url,
+                            data=form_fields,
+                            files={file_field: (apk_path.name, f, 'application/octet-stream')},
+                            timeout=300,  # 5 minutes for large files
+                        )
+
         except requests.RequestException as e:
             return False, f"Upload request failed: {e}"
         except IOError as e:
@@ -378,13 +612,16 @@ class DevCenterUploader:
         
         # Check response
         if response.status_code in (200, 201, 302):
-            # Check for success indicators
-            if 'success' in response.text.lower() or 'uploaded' in response.text.lower():
+            # One pass over the raw bytes covers all outcome keywords -
+            # no lowercased copy, no charset decode
+            match = _RE_UPLOAD_OUTCOME.search(response.content)
+            outcome = match.group(0).lower() if match else b''
+            if outcome in (b'success', b'uploaded'):
                 return True, "Upload successful!"
-            if 'error' in response.text.lower() or 'failed' in response.text.lower():
+            if outcome in (b'error', b'failed'):
                 # Try to extract error message
-                soup = BeautifulSoup(response.text, 'html.parser')
-                error = soup.find(class_=re.compile(r'error|alert', re.I))
+                soup = _make_soup(response.text)
+                error = soup.find(class_=_RE_ALERT_CLASS)
                 if error:
                     return False, f"Upload failed: {error.get_text(strip=True)}"
             # Assume success on redirect
@@ -398,10 +635,20 @@ class DevCenterUploader:
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
+        # Persist cookies and skip logout so the server session survives
+        # for the next invocation; log out only if saving fails
+        if self.logged_in and not self.dry_run:
+            try:
+                self._cookie_path.parent.mkdir(parents=True, exist_ok=True)
+                self._cookie_path.write_text(
+                    json.dumps(requests.utils.dict_from_cookiejar(self.session.cookies)))
+                return
+            except OSError:
+                pass
         self.logout()
 
 
-def parse_args():
+def parse_args() -> argparse.Namespace:
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(
         description='Upload APK packages to ASUSTOR Dev Center',
@@ -437,6 +684,12 @@ def parse_args():
         help='Changelog/release notes for this version'
     )
     
+    parser.add_argument(
+        '--list', '-l',
+        action='store_true',
+        help='List your apps before uploading (extra page fetch)'
+    )
+
     parser.add_argument(
         '--dry-run', '-n',
         action='store_true',
@@ -452,18 +705,29 @@ def parse_args():
     return parser.parse_args()
 
 
-def main():
+def main() -> None:
     """Main entry point."""
     args = parse_args()
     
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
-    # Validate inputs
-    if not args.apk.exists():
+    # Validate inputs before any network I/O - a whitespace password or a
+    # corrupt APK should not cost a TLS handshake to find out
+    args.username = args.username.strip()
+    args.password = args.password.strip()
+
+    try:
+        with args.apk.open('rb') as f:
+            magic = f.read(4)
+    except OSError:
         logger.error("APK file not found: %s", args.apk)
         sys.exit(1)
-    
+
+    if magic != b'PK\x03\x04':
+        logger.error("Not a valid APK (zip) file: %s", args.apk)
+        sys.exit(1)
+
     if not args.dry_run and (not args.username or not args.password):
         logger.error("Username and password are required (use -u/-p or environment variables)")
         sys.exit(1)
@@ -485,10 +749,11 @@ def main():
             logger.error("Login failed!")
             sys.exit(1)
         
-        # List apps (optional, for verification)
-        apps = uploader.get_app_list()
-        if apps:
-            logger.info("Your apps: %s", ', '.join(a['name'] for a in apps[:5]))
+        # List apps (opt-in: the upload itself never consumes the listing)
+        if args.list:
+            apps = uploader.get_app_list()
+            if apps and logger.isEnabledFor(logging.INFO):
+                logger.info("Your apps: %s", ', '.join([a['name'] for a in apps[:5]]))
         
         # Upload
         success, message = uploader.upload_apk(args.apk, args.changelog)